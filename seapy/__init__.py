@@ -16,6 +16,20 @@ The :class:`seapy.system.System` class contains methods for solving the SEA mode
     :no-members:
 .. automodule:: seapy.system
     :no-members:
+.. automodule:: seapy.solvers
+    :no-members:
+.. automodule:: seapy.transient
+    :no-members:
+.. automodule:: seapy.uncertainty
+    :no-members:
+.. automodule:: seapy.sweep
+    :no-members:
+.. automodule:: seapy.sensitivity
+    :no-members:
+.. automodule:: seapy.optimization
+    :no-members:
+.. automodule:: seapy.experimental
+    :no-members:
 .. automodule:: seapy.materials
     :no-members:
 .. automodule:: seapy.components
@@ -35,6 +49,13 @@ The :class:`seapy.system.System` class contains methods for solving the SEA mode
 __version__ = "0.0.0"
 
 from . import system
+from . import solvers
+from . import transient
+from . import uncertainty
+from . import sweep
+from . import sensitivity
+from . import optimization
+from . import experimental
 from . import junctions
 from . import components
 from . import subsystems
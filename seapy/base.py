@@ -35,6 +35,7 @@ Descriptors
 """
 
 import abc
+import functools
 import math
 import cmath
 import numpy as np
@@ -175,6 +176,8 @@ class Link(object, metaclass=abc.ABCMeta):
         ]  # getattr(obj, self.reference)#obj.__dict__[self.reference]
         items.add(instance)
 
+        instance.system._changed(instance)
+
     def __delete__(self, instance):
         setattr(instance, self.attribute, None)
 
@@ -342,8 +345,7 @@ class Name(object):
     def __set__(self, instance, value):
         if instance.name is None:
             """Set unique name."""
-            names = (obj.name for obj in instance.system.objects)
-            if value in names:
+            if value in instance.system._names:
                 msg = "Name {} is not unique.".format(str(value))
                 warnings.warn(msg, NameWarning)
                 value += "1"
@@ -352,6 +354,18 @@ class Name(object):
             raise ValueError("Cannot change name.")
 
 
+def _overridable(clf):
+    """Return :attr:`loss_factor` instead of `clf` when it has non-zero values."""
+
+    @functools.wraps(clf)
+    def wrapper(self):
+        if self._specified("loss_factor"):
+            return self.loss_factor
+        return clf(self)
+
+    return wrapper
+
+
 class MetaBase(type):
     """Metaclass that prepares :class:`Base`.
 
@@ -359,6 +373,7 @@ class MetaBase(type):
 
     * sets :attr:`LinkedList.attribute`
     * sets :attr:`Attribute.attribute`
+    * lets a specified :attr:`seapy.couplings.coupling.Coupling.loss_factor` override the `clf` of a coupling
 
     """
 
@@ -373,6 +388,11 @@ class MetaBase(type):
             for attr, sort in attrs["SUBSYSTEMS"].items():
                 attrs[attr] = SubsystemDescriptor(attr)
 
+        # Coupling-specific. A loss factor specified by the user overrides the model of the coupling.
+        if isinstance(attrs.get("clf"), property):
+            clf = attrs["clf"]
+            attrs["clf"] = property(_overridable(clf.fget), doc=clf.__doc__)
+
         for key, value in attrs.items():
             if isinstance(value, LinkedList):
                 value.attribute = key  # Inform LinkedList of attribute name.
@@ -403,10 +423,15 @@ class MetaBase(type):
 
 class Attribute(object):
     """Descriptor for storing spectral values.
+
+    When a tracked attribute is assigned, the system is informed which frequency bands changed.
+    Note that changing elements in-place, e.g. ``obj.loss_factor[2] = 0.1``, is not tracked.
     """
 
-    def __init__(self, dtype="float64"):
+    def __init__(self, dtype="float64", tracked=True):
         self.dtype = dtype
+        self.tracked = tracked
+        """Whether assignments are reported to :meth:`seapy.system.System._changed`."""
         self.attribute = None
         """Attribute will be set by Base.__init__"""
 
@@ -417,10 +442,16 @@ class Attribute(object):
             return instance.__dict__[self.attribute]
 
     def __set__(self, instance, value):
+        values = instance.__dict__[self.attribute]
+        previous = values.copy() if self.tracked else None
         try:
-            instance.__dict__[self.attribute][:] = value
+            values[:] = value
         except ValueError:
             raise ValueError("Invalid value.")
+        if self.tracked:
+            bands = np.any(values != previous, axis=tuple(range(values.ndim - 1)))
+            if bands.any():
+                instance.system._changed(instance, bands)
 
 
 class Base(object, metaclass=MetaBase):  # , metaclass=abc.ABCMeta):
@@ -474,7 +505,9 @@ class Base(object, metaclass=MetaBase):  # , metaclass=abc.ABCMeta):
         for cl in self.__class__.__mro__:
             for key, value in cl.__dict__.items():
                 if isinstance(value, Attribute):
-                    self.__dict__[key] = np.zeros(len(self.frequency))
+                    self.__dict__[key] = np.zeros(
+                        len(self.frequency), dtype=value.dtype
+                    )
 
         # for key, value in self.__class__.__dict__.items():
         ##if isinstance(value, LinkedList):
@@ -574,10 +607,24 @@ class Base(object, metaclass=MetaBase):  # , metaclass=abc.ABCMeta):
         """
         return self.__dict__["enabled"]
 
-    # @enabled.setter
-    # def enabled(self, x):
-    # if isinstance(x, bool):
-    # self.__dict__['enabled'] = x
+    @enabled.setter
+    def enabled(self, x):
+        self.__dict__["enabled"] = bool(x)
+        self.system._changed(self)
+
+    def _specified(self, attribute):
+        """Whether `attribute` has non-zero values in any frequency band.
+
+        :param attribute: Name of a :class:`Attribute`.
+        :rtype: :func:`bool`
+
+        Within :meth:`seapy.system.System.select` the bands that are not selected are considered as well,
+        so a property evaluated for a selection of bands equals the same property evaluated for all bands.
+        """
+        try:
+            return self.system._specified[(self.name, attribute)]
+        except KeyError:
+            return bool(getattr(self, attribute).any())
 
     @property
     def frequency(self):
@@ -98,7 +98,7 @@ class Component(Base):
         :param subsystems: Disable subsystems
         :type subsystems: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if subsystems:
             for subsystem in self.linked_subsystems:
@@ -111,7 +111,7 @@ class Component(Base):
         :param subsystems: Enable subsystems
         :type subsystems: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if subsystems:
             for subsystem in self.linked_subsystems:
@@ -139,7 +139,7 @@ class Component(Base):
 
         obj = model(name, self.system, **properties)
         # obj = model(name, self.system.get_object(self.name), **properties)
-        self.system._objects.append(obj)
+        self.system._register(obj)
         # obj = self.system._add_object(name, model, **properties)
         # obj = model(name, self.system.get_object(self.name), **properties)
         obj = self.system.get_object(obj.name)
@@ -12,7 +12,7 @@ import math
 import cmath
 import numpy as np
 
-from ..base import Base, JunctionLink, SubsystemFromLink, SubsystemToLink
+from ..base import Attribute, Base, JunctionLink, SubsystemFromLink, SubsystemToLink
 
 
 class Coupling(Base):
@@ -39,6 +39,16 @@ class Coupling(Base):
     Type of subsystem destination for coupling
     """
 
+    loss_factor = Attribute()
+    """Coupling loss factor specified by the user, e.g. a measured or estimated value.
+
+    If :attr:`loss_factor` has non-zero values, then those values are used as :attr:`clf`
+    instead of the values of the model of the coupling.
+
+    .. seealso:: :func:`seapy.experimental.power_injection`
+
+    """
+
     # size = None
     # """
     # Size of the coupling.
@@ -78,7 +88,7 @@ class Coupling(Base):
         :param subsystems: Disable subsystems
         :type subsystems: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if subsystems:
             self.subsystem_from.disable()
@@ -91,7 +101,7 @@ class Coupling(Base):
         :param subsystems: Enable subsystems
         :type subsystems: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if subsystems:
             self.subsystem_from.enable()
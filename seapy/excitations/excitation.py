@@ -43,7 +43,7 @@ class Excitation(Base):
         :param subsystem: Disable subsystem
         :type subsystem: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if subsystem:
             self.subsystem.disable()
@@ -55,7 +55,7 @@ class Excitation(Base):
         :param subsystem: Enable subsystem
         :type subsystem: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if subsystem:
             self.subsystem.enable()
@@ -61,9 +61,9 @@ class ExcitationPointForce(ExcitationPoint):
         * mobility :math:`Y`.
         
         """
-        if self.force.any():
+        if self._specified("force"):
             return self.force ** 2.0 * self.mobility.real
-        elif self.velocity.any():
+        elif self._specified("velocity"):
             return self.velocity ** 2.0 * self.impedance.real
         else:
             raise ValueError("Neither force nor velocity is specified.")
@@ -100,9 +100,9 @@ class ExcitationPointMoment(ExcitationPoint):
         * mobility :math:`Y`.
     
         """
-        if self.moment.any():
+        if self._specified("moment"):
             return self.moment ** 2.0 * self.mobility.real
-        elif self.velocity.any():
+        elif self._specified("velocity"):
             return self.velocity ** 2.0 * self.impedance.real
         else:
             raise ValueError("Neither moment nor velocity is specified.")
@@ -140,9 +140,9 @@ class ExcitationPointVolume(ExcitationPoint):
         * mobility :math:`Y`
         
         """
-        if self.pressure.any():
+        if self._specified("pressure"):
             return self.pressure ** 2.0 * self.mobility.real
-        elif self.velocity.any():
+        elif self._specified("velocity"):
             return self.velocity ** 2.0 * self.impedance.real
         else:
             raise ValueError("Neither pressure nor velocity is specified.")
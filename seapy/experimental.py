@@ -0,0 +1,133 @@
+"""
+Experimental SEA
+================
+
+Loss factors are often determined experimentally, e.g. to calibrate a model with measurements on a test rig.
+With the power injection method power is injected in the subsystems, one configuration at a time,
+and the energies of all subsystems are measured. The damping and coupling loss factors then follow from the power balance.
+
+.. autofunction:: seapy.experimental.power_injection
+
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+
+def power_injection(
+    system, power, energy, subsystems=None, nonnegative=False, update=True
+):
+    """Estimate damping and coupling loss factors from injected powers and measured energies.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param power: Injected power in watt with shape `(subsystems, configurations, bands)`.
+    :param energy: Measured energies in joule with shape `(subsystems, configurations, bands)`.
+    :param subsystems: Names of the subsystems, in order of the rows of `power` and `energy`. By default the included subsystems.
+    :param nonnegative: Constrain the loss factors to be non-negative. Requires :mod:`scipy`.
+    :param update: Assign the estimates in the enabled bands to :attr:`seapy.subsystems.subsystem.Subsystem.loss_factor`
+        and :attr:`seapy.couplings.coupling.Coupling.loss_factor`. In the other bands the current damping and
+        coupling loss factors are assigned.
+    :returns: Loss factors. The index contains the names of the subsystems, for the damping loss factors,
+        and of the couplings, and the columns the center frequencies of the enabled bands.
+    :rtype: :class:`pandas.DataFrame`
+
+    In every configuration `k` the power balance of subsystem `i` is
+
+    .. math:: \\frac{P_i^{(k)}}{\\omega} = \\eta_{i} E_i^{(k)} + \\sum_{j \\neq i} \\left( \\eta_{ij} E_i^{(k)} - \\eta_{ji} E_j^{(k)} \\right)
+
+    which is linear in the damping loss factors :math:`\\eta_{i}` and the coupling loss factors :math:`\\eta_{ij}`.
+    The unknowns are the damping loss factors of the subsystems and the coupling loss factors of the included couplings
+    between them. With as many configurations as subsystems, e.g. injecting power in every subsystem in turn,
+    the system of equations is overdetermined. The systems of all enabled bands are assembled together
+    and solved in the least-squares sense with the pseudo-inverse, or one by one with
+    :func:`scipy.optimize.nnls` when `nonnegative` is set. The columns are scaled to unit norm before solving.
+
+    Couplings between the same subsystems in the same direction cannot be distinguished.
+    Their total loss factor is divided among them.
+
+    """
+    subsystems = [
+        system.get_object(name)
+        for name in (
+            [
+                subsystem.name
+                for subsystem in system.subsystems
+                if subsystem.included is True
+            ]
+            if subsystems is None
+            else subsystems
+        )
+    ]
+    position = {subsystem.name: i for i, subsystem in enumerate(subsystems)}
+    couplings = [
+        coupling
+        for subsystem in subsystems
+        for coupling in subsystem.linked_couplings_from
+        if coupling.included and coupling.subsystem_to.name in position
+    ]
+    n, m = len(subsystems), len(subsystems) + len(couplings)
+
+    enabled = system.frequency.enabled.copy()
+    power = np.asarray(power, dtype=float)
+    energy = np.asarray(energy, dtype=float)
+    if (
+        power.ndim != 3
+        or power.shape != energy.shape
+        or power.shape[::2] != (n, len(system.frequency))
+    ):
+        raise ValueError("Invalid shape of power or energy. Cannot estimate.")
+
+    # Row `i` of column `u` of the power balance equals `incidence[i, u]` times the energy in subsystem `source[u]`.
+    source = np.array(
+        list(range(n)) + [position[c.subsystem_from.name] for c in couplings],
+        dtype=int,
+    )
+    incidence = np.zeros((n, m))
+    incidence[np.arange(n), np.arange(n)] = 1.0
+    for u, coupling in enumerate(couplings, start=n):
+        incidence[position[coupling.subsystem_from.name], u] = 1.0
+        incidence[position[coupling.subsystem_to.name], u] -= 1.0
+
+    # Equations with shape (bands, configurations * subsystems, unknowns).
+    E = np.moveaxis(energy[..., enabled], -1, 0).transpose(0, 2, 1)
+    A = (E[:, :, None, source] * incidence).reshape(len(E), -1, m)
+    p = np.moveaxis(power / system.frequency.angular, -1, 0)[enabled]
+    p = p.transpose(0, 2, 1).reshape(len(E), -1)
+    if A.shape[1] < m:
+        logging.warning(
+            "%d equations for %d unknowns. Estimate is not unique.", A.shape[1], m
+        )
+
+    scale = np.linalg.norm(A, axis=1, keepdims=True)
+    scale[scale == 0.0] = 1.0
+    A = A / scale
+    if nonnegative:
+        from scipy.optimize import nnls
+
+        loss_factors = np.array([nnls(a, b)[0] for a, b in zip(A, p)])
+    else:
+        loss_factors = (np.linalg.pinv(A) @ p[..., None])[..., 0]
+    loss_factors = loss_factors / scale[:, 0]
+    logging.info(
+        "Estimated %d loss factors in %d bands.", loss_factors.shape[1], len(E)
+    )
+
+    objects = subsystems + couplings
+    if update:
+        # The bands that are not estimated keep the loss factors of the model.
+        current = [
+            np.array(np.broadcast_to(value, enabled.shape), dtype=float)
+            for value in [subsystem.dlf for subsystem in subsystems]
+            + [coupling.clf for coupling in couplings]
+        ]
+        for obj, loss_factor, values in zip(objects, current, loss_factors.T):
+            loss_factor[enabled] = values
+            obj.loss_factor = loss_factor
+
+    return pd.DataFrame(
+        loss_factors.T,
+        index=[obj.name for obj in objects],
+        columns=system.frequency.center[enabled],
+    )
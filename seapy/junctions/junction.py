@@ -269,7 +269,7 @@ class Junction(Base):
         :param couplings: Disable couplings
         :type couplings: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if couplings:
             for coupling in self.linked_couplings:
@@ -282,7 +282,7 @@ class Junction(Base):
         :param couplings: Enable couplings
         :type couplings: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if couplings:
             for coupling in self.linked_couplings:
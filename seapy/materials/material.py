@@ -74,7 +74,7 @@ class Material(Base):
         :param components: Disable components
         :type components: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if components:
             for component in self.linked_components:
@@ -87,7 +87,7 @@ class Material(Base):
         :param components: Enable components
         :type components: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if components:
             for component in self.linked_components:
@@ -0,0 +1,116 @@
+"""
+Optimization
+============
+
+Design studies often ask where a treatment is most effective, e.g. where to apply damping material
+to reduce the sound pressure level in a room most cheaply.
+
+.. autofunction:: seapy.optimization.optimize_damping
+
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+from .solvers import Inverse
+
+
+def optimize_damping(system, target, treatments, budget=None, weights=None):
+    """Rank damping treatments by their reduction of the energy in a target subsystem per cost.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param target: Name of the subsystem of which the energy should be reduced.
+    :param treatments: Dictionary with names of treatments as keys and tuples `(subsystem, loss_factor, cost)` as values.
+        A treatment adds `loss_factor`, a scalar or a spectrum, to the damping loss factor of `subsystem`.
+    :type treatments: dict
+    :param budget: Maximum total cost. By default unlimited.
+    :param weights: Weights of the frequency bands, e.g. A-weighting as factors. By default one.
+    :returns: Chosen treatments in order of choice. The columns contain the subsystem, the cost, the total cost,
+        the level of the target and the reduction of the level.
+    :rtype: :class:`pandas.DataFrame`
+
+    The level of the target is the weighted sum of the energies of the target over the enabled bands in decibel.
+    The modal densities do not depend on damping, so the energies follow from the modal energies
+    by scaling with the modal density of the target.
+
+    The treatments are chosen greedily. Every step chooses the treatment with the largest reduction per cost,
+    until the budget is spent or no treatment reduces the level. A treatment changes one diagonal element of the
+    power balance matrix, so with the inverse of the matrices, see :class:`seapy.solvers.Inverse`,
+    the effect of every treatment follows from the Sherman-Morrison formula in :math:`O(N)` per band.
+    The inverse of a chosen treatment is updated in :math:`O(N^2)` per band. The model itself is not changed.
+
+    """
+    subsystems = [
+        subsystem for subsystem in system.subsystems if subsystem.included is True
+    ]
+    names = [subsystem.name for subsystem in subsystems]
+    r = names.index(target)
+
+    enabled = system.frequency.enabled.copy()
+    weights = np.broadcast_to(1.0 if weights is None else weights, enabled.shape)[
+        enabled
+    ]
+
+    with system.select(enabled):
+        inverse = Inverse(system, subsystems)
+        p = system.power_vectors(subsystems)
+        bands = len(system.frequency)
+        # The level is a sum of energies, which are the modal energies times the modal density.
+        weights = weights * np.broadcast_to(subsystems[r].modal_density, (bands,))
+        # Change of the diagonal element per treatment.
+        changes = {
+            name: (
+                names.index(subsystem),
+                np.broadcast_to(loss_factor, enabled.shape)[enabled]
+                * np.broadcast_to(system.get_object(subsystem).modal_density, (bands,)),
+                cost,
+            )
+            for name, (subsystem, loss_factor, cost) in treatments.items()
+        }
+
+    def level(energy):
+        return 10.0 * np.log10(np.sum(weights * energy))
+
+    modal_energy = (inverse.inverse @ p[..., None])[..., 0]
+    current = level(modal_energy[:, r])
+    spent = 0.0
+    chosen = []
+    remaining = dict(changes)
+    while remaining:
+        options = dict()
+        for name, (i, change, cost) in remaining.items():
+            if budget is not None and spent + cost > budget:
+                continue
+            # Sherman-Morrison for the change of diagonal element `i`.
+            column = inverse.inverse[:, :, i]
+            energy = modal_energy[:, r] - column[:, r] * change * modal_energy[:, i] / (
+                1.0 + change * column[:, i]
+            )
+            reduction = current - level(energy)
+            if reduction > 0.0:
+                options[name] = (reduction / cost if cost else np.inf, reduction)
+        if not options:
+            break
+
+        name = max(options, key=lambda name: options[name])
+        i, change, cost = remaining.pop(name)
+        matrices = inverse.matrices[:, :, [i]].copy()
+        matrices[:, i, 0] += change
+        inverse.update([i], matrices)
+        modal_energy = (inverse.inverse @ p[..., None])[..., 0]
+        current = level(modal_energy[:, r])
+        spent += cost
+        chosen.append(
+            (name, treatments[name][0], cost, spent, current, options[name][1])
+        )
+        logging.info(
+            "Chose treatment %s, reducing the level by %f dB.", name, options[name][1]
+        )
+
+    return pd.DataFrame(
+        [values[1:] for values in chosen],
+        index=pd.Index([values[0] for values in chosen], name="treatment"),
+        columns=["subsystem", "cost", "total_cost", "level", "reduction"],
+    )
@@ -0,0 +1,147 @@
+"""
+Sensitivity
+===========
+
+Derivatives of a quantity of a subsystem, e.g. the sound pressure level in a receiving room,
+with respect to parameters of the model. The derivatives of the modal energies are obtained
+with the adjoint method, so their cost hardly depends on the amount of parameters.
+
+.. autofunction:: seapy.sensitivity.sensitivities
+
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+
+def sensitivities(
+    system, target, parameters, quantity="pressure_level", step=1.0e-6, normalized=False
+):
+    """Sensitivities of a quantity of a subsystem with respect to parameters.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param target: Name of the subsystem.
+    :param parameters: Iterable with tuples `(object, attribute)` with the names of an object and of an attribute.
+        The attribute is a :class:`seapy.base.Attribute`, or `clf` for a coupling.
+    :param quantity: Name of the quantity of the target, e.g. `pressure_level`, `velocity_level` or `modal_energy`.
+    :param step: Relative step of the central differences.
+    :param normalized: Multiply the derivatives with the values of the parameters.
+        The sensitivities are then the changes of the quantity per relative change of the parameters.
+    :returns: Derivatives of the quantity. The index contains the parameters, as `object.attribute`,
+        and the columns the center frequencies of the enabled bands.
+    :rtype: :class:`pandas.DataFrame`
+
+    With :math:`B M = p` the power balance, see :meth:`seapy.system.System.power_balance_matrices`,
+    the derivative of the modal energy :math:`M_r` of the target with respect to a parameter :math:`\\theta` is
+
+    .. math:: \\frac{\\mathrm{d} M_r}{\\mathrm{d} \\theta} = \\lambda^T \\left( \\frac{\\partial p}{\\partial \\theta} - \\frac{\\partial B}{\\partial \\theta} M \\right)
+
+    where the adjoint :math:`\\lambda` is the solution of :math:`B^T \\lambda = e_r`.
+    Every band is factorized once, after which :math:`M` and :math:`\\lambda` cost a back-substitution each.
+
+    The derivatives of the matrices are exact for coupling loss factors. For attributes they are central differences
+    of the assembly, which are evaluated for all parameters at once with :meth:`seapy.system.System.batch`.
+    Quantities that depend on the parameters directly, e.g. the sound pressure level on the volume of a room,
+    include that dependency as well.
+
+    This function requires :mod:`scipy`.
+
+    """
+    from scipy.linalg import lu_factor, lu_solve
+
+    parameters = list(dict.fromkeys(parameters))
+    attributes = [key for key in parameters if key[1] != "clf"]
+    subsystems = [
+        subsystem for subsystem in system.subsystems if subsystem.included is True
+    ]
+    names = [subsystem.name for subsystem in subsystems]
+    r = names.index(target)
+
+    enabled = system.frequency.enabled.copy()
+    bands = int(enabled.sum())
+
+    # Two samples per attribute and two for the modal energy of the target, which are all central differences.
+    samples = 2 * len(attributes) + 2
+    values = dict()
+    steps = dict()
+    for k, (obj, attribute) in enumerate(attributes):
+        value = np.broadcast_to(
+            getattr(system.get_object(obj), attribute), enabled.shape
+        )
+        steps[(obj, attribute)] = np.where(value != 0.0, np.abs(value) * step, step)
+        values[(obj, attribute)] = np.tile(value, (samples, 1))
+        values[(obj, attribute)][2 * k] += steps[(obj, attribute)]
+        values[(obj, attribute)][2 * k + 1] -= steps[(obj, attribute)]
+
+    with system.batch(values, samples), system.select(enabled):
+        B = system.power_balance_matrices(subsystems)
+        p = system.power_vectors(subsystems)
+
+        # The last samples are evaluated with the unperturbed attributes.
+        modal_energy = np.zeros((bands, len(names)))
+        adjoint = np.zeros((bands, len(names)))
+        unit = np.zeros(len(names))
+        unit[r] = 1.0
+        for f in range(bands):
+            factorization = lu_factor(B[-1, f])
+            modal_energy[f] = lu_solve(factorization, p[-1, f])
+            adjoint[f] = lu_solve(factorization, unit, trans=1)
+        logging.info("Solved modal energies and adjoint of %d bands.", bands)
+
+        # Derivatives of the modal energy of the target with respect to the attributes.
+        residual = p - (B @ modal_energy[..., None])[..., 0]
+        derivative = np.einsum("sfn,fn->sf", residual, adjoint)
+
+        # The quantity evaluated with the unperturbed modal energies and perturbed attributes.
+        for i, subsystem in enumerate(subsystems):
+            subsystem.modal_energy[:] = modal_energy[:, i]
+        delta = np.where(
+            modal_energy[:, r] != 0.0, np.abs(modal_energy[:, r]) * step, step
+        )
+        subsystems[r].modal_energy[-2] += delta
+        subsystems[r].modal_energy[-1] -= delta
+        result = np.broadcast_to(
+            getattr(subsystems[r], quantity), (samples, bands)
+        ).copy()
+        partial_modal_energy = (result[-2] - result[-1]) / (2.0 * delta)
+
+        index = dict()
+        for k, key in enumerate(attributes):
+            h = steps[key][enabled]
+            partial = (result[2 * k] - result[2 * k + 1]) / (2.0 * h)
+            total = (derivative[2 * k] - derivative[2 * k + 1]) / (2.0 * h)
+            index[key] = partial + partial_modal_energy * total
+            if normalized:
+                index[key] = index[key] * values[key][-1][enabled]
+
+        position = {name: i for i, name in enumerate(names)}
+        for obj, attribute in parameters:
+            if attribute != "clf":
+                continue
+            coupling = system.get_object(obj)
+            i = position.get(coupling.subsystem_from.name)
+            j = position.get(coupling.subsystem_to.name)
+            # The coupling adds its loss factor to the total loss factor of the subsystem it starts in.
+            total = np.zeros(bands)
+            if coupling.included and i is not None:
+                modal_density = np.broadcast_to(
+                    subsystems[i].modal_density, (samples, bands)
+                )[-1]
+                energy = modal_density * modal_energy[:, i]
+                total = -energy * adjoint[:, i]
+                if j is not None:
+                    total += energy * adjoint[:, j]
+            index[(obj, attribute)] = partial_modal_energy * total
+            if normalized:
+                clf = np.broadcast_to(coupling.clf, (samples, bands))[-1]
+                index[(obj, attribute)] = index[(obj, attribute)] * clf
+
+        center = system.frequency.center
+
+    return pd.DataFrame(
+        [index[key] for key in parameters],
+        index=["{}.{}".format(obj, attribute) for obj, attribute in parameters],
+        columns=center,
+    )
@@ -0,0 +1,533 @@
+"""
+Solvers
+=======
+
+The solvers in this module determine the modal energies of the subsystems of a :class:`seapy.system.System`.
+Every solver takes the system and a list of subsystems and returns the modal energies as an array
+with shape `(subsystems, bands)`.
+
+Before calling a solver, :meth:`seapy.system.System.solve` restricts the model to the enabled frequency bands,
+see :meth:`seapy.system.System.select`. Solvers therefore solve every band of :attr:`seapy.system.System.frequency`.
+
+Which solver is used is chosen with the `method` argument of :meth:`seapy.system.System.solve`.
+
+.. autofunction:: seapy.solvers.solve_dense
+.. autofunction:: seapy.solvers.solve_batched
+.. autofunction:: seapy.solvers.solve_sparse
+.. autodata:: seapy.solvers.orderings
+.. autofunction:: seapy.solvers.solve_mixed
+.. autofunction:: seapy.solvers.solve_iterative
+.. autofunction:: seapy.solvers.solve_incremental
+.. autofunction:: seapy.solvers.cached_inverse
+.. autofunction:: seapy.solvers.solve_triangular
+
+.. autodata:: seapy.solvers.solvers_map
+
+.. autoclass:: seapy.solvers.Inverse
+
+"""
+
+import logging
+import warnings
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+from .tools import graph_couplings
+
+
+def solve_dense(system, subsystems):
+    """Solve the power balance band by band.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    Every band is solved with a separate call to :func:`numpy.linalg.solve`.
+
+    """
+    energies = np.zeros((len(subsystems), len(system.frequency)))
+    for f, (p, B) in enumerate(
+        zip(system.power_vector(subsystems), system.power_balance_matrix(subsystems))
+    ):
+        # Left division results in the modal energies.
+        energies[:, f] = np.linalg.solve(B, p)
+    return energies
+
+
+def _solve_stack(B, p, blas_threads=None):
+    """Solve a stack of matrices `B` with a stack of vectors `p`.
+
+    :param blas_threads: Maximum amount of threads BLAS may use. Requires :mod:`threadpoolctl`.
+    """
+    if blas_threads is None:
+        return np.linalg.solve(B, p[..., None])[..., 0]
+
+    from threadpoolctl import threadpool_limits
+
+    with threadpool_limits(limits=blas_threads, user_api="blas"):
+        return np.linalg.solve(B, p[..., None])[..., 0]
+
+
+def solve_batched(
+    system, subsystems, workers=None, executor="process", blas_threads=None
+):
+    """Solve the power balance of all bands at once.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :param workers: Amount of workers. By default the bands are solved in the current thread.
+    :param executor: Either `"process"` or `"thread"`.
+    :param blas_threads: Maximum amount of threads BLAS may use per worker. Requires :mod:`threadpoolctl`.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    The matrices of all bands are stacked and solved with a single call to :func:`numpy.linalg.solve`.
+
+    The bands are independent. When `workers` is given, the stack is split in one chunk per worker and the chunks
+    are solved in a :class:`concurrent.futures.ProcessPoolExecutor` or :class:`concurrent.futures.ThreadPoolExecutor`.
+    Every band is solved with the same LAPACK routine as in the serial case.
+    Limit `blas_threads` to avoid oversubscribing the cores when BLAS itself is multi-threaded.
+
+    """
+    B = system.power_balance_matrices(subsystems)
+    p = system.power_vectors(subsystems)
+
+    # Samples of :meth:`seapy.system.System.batch` are solved as if they were extra bands.
+    shape = p.shape
+    energies = np.zeros((len(subsystems),) + shape[:-1])
+    if not B.size:
+        return energies
+    B = B.reshape((-1,) + B.shape[-2:])
+    p = p.reshape(-1, shape[-1])
+
+    if workers is None:
+        energies[:] = np.moveaxis(
+            _solve_stack(B, p, blas_threads).reshape(shape), -1, 0
+        )
+    else:
+        try:
+            Executor = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}[
+                executor
+            ]
+        except KeyError:
+            raise ValueError("Unknown executor.")
+        chunks = np.array_split(np.arange(len(B)), min(workers, len(B)))
+        with Executor(max_workers=workers) as pool:
+            results = pool.map(
+                _solve_stack,
+                (B[chunk] for chunk in chunks),
+                (p[chunk] for chunk in chunks),
+                (blas_threads for chunk in chunks),
+            )
+            energies[:] = np.moveaxis(
+                np.concatenate(list(results)).reshape(shape), -1, 0
+            )
+    logging.info("Solved %d bands.", len(B))
+    return energies
+
+
+def solve_sparse(system, subsystems, ordering="colamd"):
+    """Solve the power balance band by band using sparse matrices.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :param ordering: Fill-reducing ordering. See :attr:`orderings`.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    The matrices are assembled in compressed sparse column format directly from the couplings
+    and solved with a sparse LU factorization, see :func:`scipy.sparse.linalg.splu`.
+    Memory usage therefore scales with the amount of couplings and not with the square of the amount of subsystems.
+
+    The order of the subsystems determines the fill-in of the factorization. With `"rcm"` the subsystems are
+    renumbered with :func:`scipy.sparse.csgraph.reverse_cuthill_mckee`, which reduces the bandwidth of
+    e.g. rooms in a building. The permutation is determined once, because the sparsity pattern is equal in
+    every band, and undone before returning the modal energies. The other orderings are applied by SuperLU.
+    The default is the column ordering SuperLU uses by itself.
+
+    This solver requires :mod:`scipy`.
+
+    """
+    from scipy.sparse.linalg import splu
+
+    try:
+        permc_spec = orderings[ordering]
+    except KeyError:
+        raise ValueError("Unknown ordering.")
+
+    energies = np.zeros((len(subsystems), len(system.frequency)))
+    order = None
+    for f, (p, B) in enumerate(
+        zip(
+            system.power_vector(subsystems),
+            system.power_balance_matrix(subsystems, sparse=True),
+        )
+    ):
+        if ordering == "rcm":
+            if order is None:
+                from scipy.sparse.csgraph import reverse_cuthill_mckee
+
+                order = reverse_cuthill_mckee(B + B.T, symmetric_mode=True)
+            B = B[order][:, order]
+            p = p[order]
+        else:
+            order = slice(None)
+        # SuperLU requires the right-hand side in the precision of the matrix.
+        energies[order, f] = splu(B, permc_spec=permc_spec).solve(p.astype(B.dtype))
+    return energies
+
+
+orderings = {
+    "colamd": "COLAMD",
+    "mmd": "MMD_AT_PLUS_A",
+    "rcm": "NATURAL",
+    "natural": "NATURAL",
+}
+"""Fill-reducing orderings of :func:`solve_sparse` and the corresponding `permc_spec` of :func:`scipy.sparse.linalg.splu`.
+
+* `"colamd"`: approximate minimum degree column ordering. This is the default of SuperLU.
+* `"mmd"`: multiple minimum degree ordering of the structure of :math:`B^T + B`.
+* `"rcm"`: reverse Cuthill-McKee ordering of the subsystems.
+* `"natural"`: order of the subsystems.
+
+"""
+
+
+def solve_mixed(system, subsystems, refinement=2):
+    """Solve the power balance band by band in single precision with iterative refinement in double precision.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :param refinement: Amount of refinement steps.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    Every matrix is factorized once in single precision with :func:`scipy.linalg.lu_factor`.
+    The residual of the solution is then computed in double precision and the factorization is reused
+    to solve for a correction. One or two steps recover an accuracy close to that of a double precision solve.
+    The amount of steps and the relative residual per band are stored in :attr:`seapy.system.System.convergence`.
+
+    When the matrices are assembled in single precision, see :attr:`seapy.system.System.precision`,
+    the residual is computed with the single precision matrices.
+
+    This solver requires :mod:`scipy`.
+
+    """
+    from scipy.linalg import lu_factor, lu_solve
+
+    energies = np.zeros((len(subsystems), len(system.frequency)))
+    residuals = np.zeros(len(system.frequency))
+    for f, (p, B) in enumerate(
+        zip(system.power_vector(subsystems), system.power_balance_matrix(subsystems))
+    ):
+        factorization = lu_factor(B.astype(np.float32))
+        B = B.astype(np.float64)
+        x = lu_solve(factorization, p.astype(np.float32)).astype(np.float64)
+        for _ in range(refinement):
+            r = p - B @ x
+            x += lu_solve(factorization, r.astype(np.float32))
+        residuals[f] = np.linalg.norm(p - B @ x) / (np.linalg.norm(p) or 1.0)
+        energies[:, f] = x
+
+    system.convergence = pd.DataFrame(
+        {"iterations": refinement, "residual": residuals},
+        index=system.frequency.center,
+    )
+    return energies
+
+
+def _preconditioner(B, preconditioner):
+    """Preconditioner for the iterative solvers.
+
+    :param B: Sparse power balance matrix.
+    :param preconditioner: Either `None`, `"jacobi"` or `"ilu"`.
+    """
+    from scipy.sparse.linalg import LinearOperator, spilu
+
+    if preconditioner is None:
+        return None
+    elif preconditioner == "jacobi":
+        diagonal = B.diagonal()
+        return LinearOperator(B.shape, matvec=lambda x: x / diagonal)
+    elif preconditioner == "ilu":
+        return LinearOperator(B.shape, matvec=spilu(B).solve)
+    else:
+        raise ValueError("Unknown preconditioner.")
+
+
+def solve_iterative(
+    system,
+    subsystems,
+    solver="gmres",
+    preconditioner="jacobi",
+    rtol=1e-10,
+    maxiter=None,
+    warm_start=True,
+):
+    """Solve the power balance band by band using an iterative solver.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :param solver: Iterative solver. Either `"gmres"` or `"bicgstab"`.
+    :param preconditioner: Preconditioner. Either `None`, `"jacobi"` or `"ilu"`.
+    :param rtol: Relative tolerance of the residual.
+    :param maxiter: Maximum amount of iterations per band.
+    :param warm_start: Take the initial guess from the solution of the previous band.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    The matrices are assembled in sparse format, see :meth:`seapy.system.System.power_balance_matrix`.
+    Modal energies change smoothly between adjacent bands. With `warm_start` the solution of the previous band,
+    scaled with the ratio of the input powers, is therefore used as initial guess.
+
+    The amount of iterations and the relative residual of every solved band are stored in :attr:`seapy.system.System.convergence`.
+
+    This solver requires :mod:`scipy`.
+
+    """
+    from scipy.sparse import linalg
+
+    try:
+        method = {"gmres": linalg.gmres, "bicgstab": linalg.bicgstab}[solver]
+    except KeyError:
+        raise ValueError("Unknown iterative solver.")
+
+    energies = np.zeros((len(subsystems), len(system.frequency)))
+    iterations = np.zeros(len(system.frequency), dtype=int)
+    residuals = np.zeros(len(system.frequency))
+
+    previous = None
+    for f, (p, B) in enumerate(
+        zip(
+            system.power_vector(subsystems),
+            system.power_balance_matrix(subsystems, sparse=True),
+        )
+    ):
+        x0 = None
+        if warm_start and previous is not None:
+            x, norm = previous
+            x0 = x * np.linalg.norm(p) / norm if norm else x
+
+        count = [0]
+
+        def callback(*args):
+            count[0] += 1
+
+        kwargs = {"callback_type": "pr_norm"} if solver == "gmres" else {}
+        x, info = method(
+            B,
+            p,
+            x0=x0,
+            rtol=rtol,
+            maxiter=maxiter,
+            M=_preconditioner(B, preconditioner),
+            callback=callback,
+            **kwargs
+        )
+        if info > 0:
+            warnings.warn(
+                "Iterative solver did not converge for band {}.".format(
+                    system.frequency.center[f]
+                )
+            )
+        elif info < 0:
+            raise ValueError("Illegal input for the iterative solver.")
+
+        norm = np.linalg.norm(p)
+        energies[:, f] = x
+        iterations[f] = count[0]
+        residuals[f] = np.linalg.norm(p - B @ x) / norm if norm else 0.0
+        previous = (x, norm)
+
+    system.convergence = pd.DataFrame(
+        {"iterations": iterations, "residual": residuals},
+        index=system.frequency.center,
+    )
+    logging.info("Iterations per band: %s", iterations)
+    return energies
+
+
+def cached_inverse(system, subsystems):
+    """Inverse of the power balance matrices of `subsystems`, kept up to date with the changes of the model.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :rtype: :class:`Inverse`
+
+    The inverse is computed once and cached on the system, see :class:`Inverse`.
+    Afterwards, the changes tracked by :meth:`seapy.system.System._changed` determine what is recomputed.
+    Only the columns of the changed subsystems are reassembled, and the inverse is updated
+    only for the changed bands. When the included subsystems or the enabled bands change, everything is recomputed.
+
+    An inverse is kept for every list of subsystems, e.g. for every block of :meth:`seapy.system.System.blocks`.
+    Cached inverses of other lists that contain changed subsystems are discarded.
+
+    """
+    if system._changed_structure:
+        system._inverse.clear()
+        system._changes.clear()
+        system._changed_structure = False
+
+    key = tuple(subsystem.name for subsystem in subsystems)
+    changes = [system._changes.pop(name, set()) for name in key]
+    changed = {name for name, bands in zip(key, changes) if bands}
+    for other in list(system._inverse):
+        if other != key and changed.intersection(other):
+            del system._inverse[other]
+
+    inverse = system._inverse.get(key)
+    if inverse is None or not inverse.valid(system, subsystems):
+        logging.info("Inverting power balance matrices...")
+        inverse = system._inverse[key] = Inverse(system, subsystems)
+    else:
+        columns = [i for i, bands in enumerate(changes) if bands]
+        bands = np.isin(system.frequency.index, list(set().union(*changes)))
+        if columns and bands.any():
+            logging.info(
+                "Updating %d columns in %d bands...", len(columns), bands.sum()
+            )
+            matrices = system._power_balance_columns(subsystems, columns)
+            inverse.update(columns, matrices, bands)
+    return inverse
+
+
+def solve_incremental(system, subsystems):
+    """Solve only what changed since the previous incremental solve.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    The modal energies are the product of the cached inverse, see :func:`cached_inverse`, and the input power.
+    When only excitations changed, solving therefore costs a matrix-vector product per band.
+
+    """
+    inverse = cached_inverse(system, subsystems)
+    p = system.power_vectors(subsystems)
+    return (inverse.inverse @ p[..., None])[..., 0].T
+
+
+def solve_triangular(system, subsystems):
+    """Solve the power balance block by block, following the direction of the couplings.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :returns: Modal energies with shape `(subsystems, bands)`.
+
+    Couplings that exist in only one direction make the power balance matrix block-triangular.
+    The strongly connected components of the graph of included couplings, see :func:`seapy.tools.graph_couplings`,
+    are the diagonal blocks. They are solved in topological order, i.e. upstream before downstream,
+    and the power flowing from a solved block into the blocks downstream is added to their input power.
+    A chain of one-way couplings is therefore solved as many small systems instead of one large system.
+
+    """
+    position = {subsystem.name: i for i, subsystem in enumerate(subsystems)}
+    graph = nx.condensation(graph_couplings(system, included=True).subgraph(position))
+
+    p = system.power_vectors(subsystems)
+    energies = np.zeros((len(subsystems), len(system.frequency)))
+    for node in nx.lexicographical_topological_sort(
+        graph,
+        key=lambda node: min(position[name] for name in graph.nodes[node]["members"]),
+    ):
+        columns = sorted(position[name] for name in graph.nodes[node]["members"])
+        B = system._power_balance_columns(subsystems, columns)
+        energies[columns] = np.linalg.solve(B[:, columns], p[:, columns, None])[
+            ..., 0
+        ].T
+        # Forward substitution of the power that flows from this block to the others.
+        p -= (B @ energies[columns].T[..., None])[..., 0]
+    logging.info("Solved %d blocks.", len(graph))
+    return energies
+
+
+solvers_map = {
+    "dense": solve_dense,
+    "batched": solve_batched,
+    "sparse": solve_sparse,
+    "mixed": solve_mixed,
+    "iterative": solve_iterative,
+    "incremental": solve_incremental,
+    "triangular": solve_triangular,
+}
+"""Map of solvers that can be selected with :meth:`seapy.system.System.solve`.
+"""
+
+
+class Inverse(object):
+    """Inverse of the power balance matrices.
+
+    The inverse is computed once and then kept up to date with low-rank updates
+    when only a few columns of the power balance matrices change.
+
+    .. seealso:: :func:`solve_incremental`
+
+    """
+
+    def __init__(self, system, subsystems):
+        """Constructor.
+
+        :param system: System
+        :type system: :class:`seapy.system.System`
+        :param subsystems: List of subsystems.
+        """
+
+        self.subsystems = [subsystem.name for subsystem in subsystems]
+        """Names of the subsystems, in order of the rows and columns.
+        """
+
+        self.center = system.frequency.center.copy()
+        """Center frequencies of the bands that are included.
+        """
+
+        self.matrices = system.power_balance_matrices(subsystems)
+        """Power balance matrices with shape `(bands, subsystems, subsystems)`.
+        """
+
+        self.inverse = np.linalg.inv(self.matrices)
+        """Inverse of :attr:`matrices`.
+        """
+
+    def valid(self, system, subsystems):
+        """Whether the inverse still applies to `subsystems` and the bands of `system`."""
+        return self.subsystems == [subsystem.name for subsystem in subsystems] and (
+            np.array_equal(self.center, system.frequency.center)
+        )
+
+    def update(self, columns, matrices, bands=None):
+        """Replace columns of the power balance matrices and update the inverse.
+
+        :param columns: Indices of the changed columns.
+        :param matrices: New columns with shape `(bands, subsystems, columns)`.
+        :param bands: Boolean array indicating which bands to update. By default all bands.
+
+        The inverse is updated with the Sherman-Morrison-Woodbury formula
+
+        .. math:: (B + U V^T)^{-1} = B^{-1} - B^{-1} U (I + V^T B^{-1} U)^{-1} V^T B^{-1}
+
+        where :math:`U` contains the change of the columns and :math:`V` selects the columns.
+        This costs :math:`O(N^2 r)` per band for `r` changed columns instead of :math:`O(N^3)`.
+
+        """
+        columns = np.asarray(columns, dtype=int)
+        bands = (
+            np.arange(len(self.matrices)) if bands is None else np.flatnonzero(bands)
+        )
+        B = self.matrices[bands]
+        A = self.inverse[bands]
+
+        AU = A @ (matrices[bands] - B[..., columns])
+        S = np.eye(len(columns)) + AU[:, columns, :]
+        B[..., columns] = matrices[bands]
+        try:
+            A -= AU @ np.linalg.solve(S, A[:, columns, :])
+        except np.linalg.LinAlgError:
+            A = np.linalg.inv(B)
+        self.matrices[bands] = B
+        self.inverse[bands] = A
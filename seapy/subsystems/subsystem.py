@@ -46,7 +46,7 @@ class Subsystem(Base):
     Set of excitations this subsystem experiences.
     """
 
-    modal_energy = Attribute()
+    modal_energy = Attribute(tracked=False)
     """Modal energy.
     """
 
@@ -75,8 +75,8 @@ class Subsystem(Base):
             )
             self.system.remove_object(excitation)
         try:
-            self.component.__dict__["linked_subsystems"].remove(self.name)
-        except ReferenceError:
+            self.component.__dict__["linked_subsystems"].discard(self)
+        except (ReferenceError, ValueError):
             pass
         # self.system.subsystems.remove(self.name)
         super().__del__()  # Inherit destructor from base class
@@ -93,7 +93,7 @@ class Subsystem(Base):
         :param couplings: Disable couplings
         :type couplings: bool
         """
-        self.__dict__["enabled"] = False
+        self.enabled = False
 
         if couplings:
             for coupling in itertools.chain(
@@ -108,7 +108,7 @@ class Subsystem(Base):
         :param couplings: Enable couplings
         :type couplings: bool
         """
-        self.__dict__["enabled"] = True
+        self.enabled = True
 
         if couplings:
             for coupling in itertools.chain(
@@ -313,7 +313,7 @@ class Subsystem(Base):
         By default this is the loss factor of the material of the component.
         
         """
-        if self.loss_factor.any():
+        if self._specified("loss_factor"):
             return self.loss_factor
         else:
             return self.component.material.loss_factor
@@ -0,0 +1,84 @@
+"""
+Sweep
+=====
+
+Parameter studies evaluate a model for every combination of the values of some attributes.
+Instead of solving a model per combination, the whole grid is evaluated at once, see :meth:`seapy.system.System.batch`.
+
+.. autofunction:: seapy.sweep.sweep
+
+"""
+
+import itertools
+import logging
+import numpy as np
+import pandas as pd
+
+
+def sweep(system, axes, quantity="modal_energy"):
+    """Evaluate a quantity of the subsystems for every combination of parameter values.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param axes: Dictionary with tuples `(object, attribute)` as keys, where `object` is the name of an object,
+        and the values of the attribute as values. The values are either scalars or spectra.
+    :type axes: dict
+    :param quantity: Name of the quantity of the subsystems, e.g. `modal_energy` or `pressure_level`.
+        Subsystems that do not have the quantity are skipped.
+    :returns: Quantity. The index contains a level per parameter, named `object.attribute`, with the index of the value
+        when the values are spectra, and a level with the names of the subsystems. The columns are the center frequencies.
+    :rtype: :class:`pandas.DataFrame`
+
+    The grid is the Cartesian product of the values of the parameters. All combinations are solved with
+    a single batched solve.
+
+    .. code-block:: python
+
+        result = sweep(
+            system,
+            {
+                ("wall", "height"): [0.05, 0.1, 0.2],
+                ("concrete", "loss_factor"): [0.01, 0.02],
+            },
+            quantity="pressure_level",
+        )
+        result.xs("room2_SubsystemLong", level="subsystem")
+
+    """
+    names = ["{}.{}".format(obj, attribute) for obj, attribute in axes]
+    values = [np.asarray(value, dtype=float) for value in axes.values()]
+    grid = np.array(
+        list(itertools.product(*(range(len(value)) for value in values))), dtype=int
+    ).reshape(-1, len(values))
+    samples = {
+        key: value[grid[:, axis]] for axis, (key, value) in enumerate(zip(axes, values))
+    }
+    logging.info("Solving %d combinations...", len(grid))
+
+    results = dict()
+    with system.batch(samples):
+        system.solve(method="batched")
+        for subsystem in system.subsystems:
+            if subsystem.included is True and hasattr(subsystem, quantity):
+                results[subsystem.name] = np.broadcast_to(
+                    getattr(subsystem, quantity), (len(grid), len(system.frequency))
+                )
+
+    labels = [
+        value.tolist() if value.ndim == 1 else list(range(len(value)))
+        for value in values
+    ]
+    index = pd.MultiIndex.from_tuples(
+        [
+            tuple(label[i] for label, i in zip(labels, combination)) + (name,)
+            for combination in grid
+            for name in results
+        ],
+        names=names + ["subsystem"],
+    )
+    data = np.stack(list(results.values()), axis=1) if results else np.zeros(0)
+    return pd.DataFrame(
+        data.reshape(len(index), len(system.frequency)),
+        index=index,
+        columns=system.frequency.center,
+    )
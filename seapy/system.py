@@ -6,6 +6,8 @@ The System class is the main class and contains methods for solving the SEA mode
 
 .. autoclass:: seapy.system.System
 
+.. autodata:: seapy.system.precisions
+
 .. autoclass:: seapy.system.Frequency
 .. autoclass:: seapy.system.Band
 
@@ -13,7 +15,9 @@ The System class is the main class and contains methods for solving the SEA mode
 
 import math
 import cmath
+import contextlib
 import numpy as np
+import networkx as nx
 
 import warnings
 import logging
@@ -22,11 +26,13 @@ import weakref
 
 from .base import Attribute
 from seapy.objects_map import objects_map
+from .solvers import solvers_map, cached_inverse
+from . import transient
 
 # from tabulate import tabulate
 # from toolz import count
 import pandas as pd
-from .tools import plot, PathAnalysis
+from .tools import plot, PathAnalysis, graph_couplings
 from .base import Base
 
 from acoustics.signal import Frequencies
@@ -43,6 +49,13 @@ _OBJECTS = [
 """List of object types in order that they should be constructed when loading from a file.
 """
 
+precisions = {"double": np.float64, "single": np.float32}
+"""Precisions of the power balance matrices and the corresponding data types.
+
+With `"single"` the matrices are assembled in single precision, halving the memory they require.
+By default they are then solved with :func:`seapy.solvers.solve_mixed`.
+"""
+
 
 class System(object):
     """
@@ -80,7 +93,15 @@ class System(object):
         :returns: Generator of objects.
         :rtype: :class:`types.GeneratorType`
         """
-        yield from (self.get_object(obj.name) for obj in self._objects)
+        yield from (self._proxies[obj.name] for obj in list(self._objects))
+
+    def _objects_of_sort(self, sort):
+        """All objects of one sort, e.g. `'Subsystem'`.
+
+        :param sort: Sort of the objects. See :attr:`seapy.base.Base.SORT`.
+        :returns: Generator of objects, in the order they were added.
+        """
+        yield from (self._proxies[name] for name in list(self._sorts.get(sort, {})))
 
     @property
     def components(self):
@@ -89,7 +110,7 @@ class System(object):
         :returns: Generator of components.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Component")
+        yield from self._objects_of_sort("Component")
 
     @property
     def subsystems(self):
@@ -98,7 +119,7 @@ class System(object):
         :returns: Generator of subsystems.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Subsystem")
+        yield from self._objects_of_sort("Subsystem")
 
     @property
     def junctions(self):
@@ -107,7 +128,7 @@ class System(object):
         :returns: Generator of junctions.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Junction")
+        yield from self._objects_of_sort("Junction")
 
     @property
     def couplings(self):
@@ -116,7 +137,7 @@ class System(object):
         :returns: Generator of couplings.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Coupling")
+        yield from self._objects_of_sort("Coupling")
 
     @property
     def materials(self):
@@ -125,7 +146,7 @@ class System(object):
         :returns: Generator of materials.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Material")
+        yield from self._objects_of_sort("Material")
 
     @property
     def excitations(self):
@@ -134,7 +155,7 @@ class System(object):
         :returns: Generator of excitations.
         :rtype: :class:`python.types.GeneratorType`
         """
-        yield from (obj for obj in self.objects if obj.SORT == "Excitation")
+        yield from self._objects_of_sort("Excitation")
 
     @property
     def frequency(self):
@@ -151,18 +172,56 @@ class System(object):
         else:
             raise ValueError("Invalid frequency object.")
 
-    def __init__(self, frequency):
+    @property
+    def precision(self):
+        """Precision of the power balance matrices. See :attr:`precisions`.
+        """
+        return self.__dict__["precision"]
+
+    @precision.setter
+    def precision(self, x):
+        if x in precisions:
+            self.__dict__["precision"] = x
+        else:
+            raise ValueError("Invalid precision.")
+
+    @property
+    def dtype(self):
+        """Data type of the power balance matrices, depending on :attr:`precision`.
+        """
+        return precisions[self.precision]
+
+    def __init__(self, frequency, precision="double"):
         """Constructor.
+
+        :param frequency: Frequency bands.
+        :param precision: Precision of the power balance matrices. See :attr:`precisions`.
         """
 
         self.frequency = frequency  # Frequency(weakref.proxy(self))
         """Frequency object.
         """
 
+        self.precision = precision
+
         self._objects = list()
         """Private set of objects this SEA model consists of.
         """
 
+        self._names = dict()
+        """Private index of :attr:`_objects` by name.
+        """
+
+        self._sorts = dict()
+        """Private index of :attr:`_objects` by sort and name.
+        """
+
+        self._proxies = dict()
+        """Private proxies of :attr:`_objects` by name.
+
+        Every object has a single proxy that is created when the object is added and discarded when it is removed.
+        """
+
         self.path_analysis = PathAnalysis(self)
         """Path analysis.
         
@@ -174,9 +233,106 @@ class System(object):
         """Switch indicating whether the system (modal energies) were solved or not.
         """
 
+        self.convergence = None
+        """Iterations and residual per band of the last iterative or mixed precision solve.
+
+        .. seealso:: :func:`seapy.solvers.solve_iterative` and :func:`seapy.solvers.solve_mixed`
+        """
+
+        self._inverse = {}
+        """Inverses of the power balance matrices used for incremental solves.
+
+        The keys are tuples with the names of the subsystems in a block, see :meth:`blocks`.
+
+        .. seealso:: :class:`seapy.solvers.Inverse`
+        """
+
+        self._changes = {}
+        """Changes since the last incremental solve.
+
+        The keys are the names of the subsystems whose column of the power balance matrix changed
+        and the values are sets with the indices of the changed frequency bands.
+        """
+
+        self._changed_structure = True
+        """Whether the model has to be assembled completely at the next incremental solve.
+        """
+
+        self._batch = ()
+        """Shape of the samples within :meth:`batch`.
+        """
+
+        self._specified = {}
+        """Whether attributes have non-zero values in the bands outside of :meth:`select`.
+
+        The keys are tuples `(object, attribute)` with names. See :meth:`seapy.base.Base._specified`.
+        """
+
+        self._modal_energies = np.zeros((0, len(self.frequency)))
+        """Modal energies of all subsystems. See :attr:`modal_energies`.
+        """
+
+        self._modal_energies_outdated = False
+        """Whether subsystems were added or removed since :attr:`_modal_energies` was allocated.
+        """
+
+    @property
+    def modal_energies(self):
+        """Modal energies of all subsystems with shape `(subsystems, bands)`.
+
+        The rows are in the order of :attr:`subsystems`. The modal energies of the subsystems,
+        see :attr:`seapy.subsystems.subsystem.Subsystem.modal_energy`, are views of the rows,
+        so the results are stored in one contiguous array that can be used directly, e.g.
+
+        .. code-block:: python
+
+            pd.DataFrame(
+                system.modal_energies,
+                index=[subsystem.name for subsystem in system.subsystems],
+                columns=system.frequency.center,
+            )
+
+        Within :meth:`batch` the shape is `(samples, subsystems, bands)`.
+        """
+        self._update_modal_energies()
+        return self._modal_energies
+
+    def _bind_modal_energies(self, modal_energies):
+        """Use `modal_energies` as storage of the modal energies of the subsystems.
+
+        Every subsystem gets a view of its row.
+        """
+        self.__dict__["_modal_energies"] = modal_energies
+        for row, subsystem in enumerate(self._sorts.get("Subsystem", {}).values()):
+            subsystem.__dict__["modal_energy"] = modal_energies[..., row, :]
+
+    def _update_modal_energies(self):
+        """Allocate :attr:`modal_energies` if subsystems were added or removed since the last allocation.
+
+        Adding or removing a subsystem only marks the storage as outdated, so building a model
+        does not reallocate the storage for every subsystem. Until then a new subsystem has an array of its own.
+        """
+        if self._modal_energies_outdated:
+            self._allocate_modal_energies()
+
+    def _allocate_modal_energies(self):
+        """Allocate :attr:`modal_energies` for the current subsystems.
+
+        The modal energies of the subsystems are kept.
+        """
+        self._modal_energies_outdated = False
+        subsystems = list(self._sorts.get("Subsystem", {}).values())
+        modal_energies = np.zeros(
+            self._batch + (len(subsystems), len(self.frequency))
+        )
+        for row, subsystem in enumerate(subsystems):
+            modal_energies[..., row, :] = subsystem.__dict__["modal_energy"]
+        self._bind_modal_energies(modal_energies)
+
     def __del__(self):
 
-        for obj in self.objects:
+        # The proxies may no longer exist when the system is garbage collected.
+        for obj in list(self._objects):
             self.remove_object(obj.name)
 
     def _get_real_object(self, name):
@@ -188,10 +344,9 @@ class System(object):
         :returns: Real `object`.
         """
         name = name if isinstance(name, str) else name.name
-        for obj in self._objects:
-            if name == obj.name:
-                return obj
-        else:
+        try:
+            return self._names[name]
+        except KeyError:
             raise ValueError("Unknown name. Cannot get object.")
 
     def get_object(self, name):
@@ -204,10 +359,9 @@ class System(object):
         
         """
         name = name if isinstance(name, str) else name.name
-        for obj in self._objects:
-            if name == obj.name:
-                return weakref.proxy(obj)
-        else:
+        try:
+            return self._proxies[name]
+        except KeyError:
             raise ValueError("Unknown name. Cannot get object.")
 
     def remove_object(self, name):
@@ -220,9 +374,25 @@ class System(object):
         
         """
         obj = self._get_real_object(name)
-        for obj in self._objects:
-            if name == obj.name:
-                self._objects.remove(obj)
+        self._changed(obj)
+        del self._names[obj.name]
+        del self._sorts[obj.SORT][obj.name]
+        del self._proxies[obj.name]
+        self._objects.remove(obj)
+        if obj.SORT == "Subsystem":
+            self._modal_energies_outdated = True
+
+    def _register(self, obj):
+        """Add a created object to :attr:`_objects` and its index.
+
+        :param obj: Real `object`.
+        """
+        self._objects.append(obj)
+        self._names[obj.name] = obj
+        self._sorts.setdefault(obj.SORT, dict())[obj.name] = obj
+        self._proxies[obj.name] = weakref.proxy(obj)
+        if obj.SORT == "Subsystem":
+            self._modal_energies_outdated = True
 
     def _add_object(self, name, model, **properties):
         """Add object to SEA model.
@@ -239,7 +409,7 @@ class System(object):
             )  # Add hidden hard reference
         except KeyError:
             raise ValueError("Model does not exist. Cannot create object.")
-        self._objects.append(obj)
+        self._register(obj)
         return self.get_object(obj.name)
 
     def add_component(self, name, model, **properties):
@@ -269,20 +439,140 @@ class System(object):
         obj = self._add_object(name, objects_map["couplings"][model], **properties)
         return obj
 
-    def power_balance_matrix(self, subsystems=None):
-        """Power balance matrix as function of frequency.
-        
+    def _loss_factors(self, subsystems, columns=None):
+        """Loss factor spectra needed to assemble the power balance.
+
+        :param subsystems: List of subsystems. The position in the list is the row/column index.
+        :param columns: Indices of the subsystems, or columns, to include. By default all.
+
+        :returns: Tuple `(index_from, index_to, clf, tlf, modal_density)`.
+
+        Every coupling loss factor, total loss factor and modal density is evaluated only once, as a full spectrum.
+        `index_from` is the position in `columns` and `index_to` the row index of the included couplings between the subsystems.
+        `clf` has shape `(couplings, bands)` and `tlf` and `modal_density` have shape `(columns, bands)`.
+        Within :meth:`batch` the samples are an extra axis in front of the bands.
+
+        """
+        index = {subsystem.name: i for i, subsystem in enumerate(subsystems)}
+        columns = range(len(subsystems)) if columns is None else columns
+        shape = self._batch + (len(self.frequency),)
+
+        couplings = [
+            (position, coupling)
+            for position, column in enumerate(columns)
+            for coupling in subsystems[column].linked_couplings_from
+            if coupling.included
+        ]
+        index_from = np.array([position for position, _ in couplings], dtype=int)
+        index_to = np.array(
+            [index.get(coupling.subsystem_to.name, -1) for _, coupling in couplings],
+            dtype=int,
+        )
+        clf = np.array(
+            [np.broadcast_to(coupling.clf, shape) for _, coupling in couplings]
+        ).reshape((len(couplings),) + shape)
+
+        modal_density = np.array(
+            [
+                np.broadcast_to(subsystems[column].modal_density, shape)
+                for column in columns
+            ]
+        ).reshape((len(columns),) + shape)
+
+        # Total loss factor. See :attr:`seapy.subsystems.subsystem.Subsystem.tlf`.
+        tlf = np.array(
+            [
+                np.broadcast_to(
+                    subsystems[column].dlf * subsystems[column].included, shape
+                )
+                for column in columns
+            ]
+        ).reshape((len(columns),) + shape)
+        np.add.at(tlf, index_from, clf)
+
+        # Couplings towards subsystems outside of the list only contribute to the total loss factor.
+        inside = index_to >= 0
+        return index_from[inside], index_to[inside], clf[inside], tlf, modal_density
+
+    def _power_balance_columns(self, subsystems, columns):
+        """Columns of the power balance matrices of all frequency bands.
+
+        :param subsystems: List of subsystems.
+        :param columns: Indices of the columns to assemble.
+        :returns: Stacked columns with shape `(bands, subsystems, columns)`.
+
+        .. seealso:: :meth:`power_balance_matrices`
+        """
+        n, m = len(subsystems), len(columns)
+        index_from, index_to, clf, tlf, modal_density = self._loss_factors(
+            subsystems, columns
+        )
+
+        # Multiple couplings between the same pair of subsystems are summed.
+        pairs, inverse = np.unique(index_to * m + index_from, return_inverse=True)
+        offdiagonal = np.zeros((len(pairs),) + clf.shape[1:])
+        np.add.at(offdiagonal, inverse, -clf * modal_density[index_from])
+
+        shape = self._batch + (len(self.frequency),)
+        B = np.zeros(shape + (n * m,), dtype=self.dtype)
+        B[..., np.asarray(columns, dtype=int) * m + np.arange(m)] = np.moveaxis(
+            tlf * modal_density, 0, -1
+        )
+        B[..., pairs] += np.moveaxis(offdiagonal, 0, -1)
+        return B.reshape(shape + (n, m))
+
+    def power_balance_matrices(self, subsystems=None):
+        """Power balance matrices of all frequency bands.
+
         :param subsystems: is a list of subsystems. Reason to give the list as argument instead of using self.subsystems is that that list might change during execution.
         :type subsystems: list
-        :param f: is the index of the center frequency of the frequency band
-        :type f: int
+        :returns: Stacked matrices with shape `(bands, subsystems, subsystems)`.
         :rtype: :class:`numpy.ndarray`
-        
+
         See Craik, equation 6.21, page 155.
-        
+
+        Element `[f, j, i]` is the loss factor from subsystem `i` to subsystem `j` multiplied with the modal density of subsystem `i`.
+        The diagonal contains the total loss factors. Instead of looping over every pair of subsystems the loss factors
+        are scattered into the stack using the indices of the couplings.
+
+        Within :meth:`batch` the shape is `(samples, bands, subsystems, subsystems)`.
+
+        """
+        subsystems = (
+            subsystems
+            if subsystems
+            else [
+                subsystem for subsystem in self.subsystems if subsystem.included is True
+            ]
+        )
+        B = self._power_balance_columns(subsystems, range(len(subsystems)))
+        logging.info("Matrices created.")
+        return B
+
+    def power_balance_matrix(self, subsystems=None, sparse=False):
+        """Power balance matrix as function of frequency.
+
+        :param subsystems: is a list of subsystems. Reason to give the list as argument instead of using self.subsystems is that that list might change during execution.
+        :type subsystems: list
+        :param sparse: Yield sparse matrices in compressed sparse column format.
+        :type sparse: bool
+        :rtype: :class:`numpy.ndarray` or :class:`scipy.sparse.csc_matrix`
+
+        See Craik, equation 6.21, page 155.
+
         Yields power balance matrices.
+
+        Sparse matrices are assembled directly from the couplings, so their memory usage scales
+        with the amount of couplings instead of with the square of the amount of subsystems.
+        Sparse matrices require :mod:`scipy`.
+
+        .. seealso:: :meth:`power_balance_matrices`
         """
-        # logging.info("Creating matrix for centerfrequency {}".format(self.frequency.center[f]))
+        if not sparse:
+            yield from self.power_balance_matrices(subsystems)
+            return
+
+        from scipy.sparse import csc_matrix
 
         subsystems = (
             subsystems
@@ -291,34 +581,29 @@ class System(object):
                 subsystem for subsystem in self.subsystems if subsystem.included is True
             ]
         )
+        n = len(subsystems)
+        index_from, index_to, clf, tlf, modal_density = self._loss_factors(subsystems)
 
+        rows = np.concatenate((np.arange(n), index_to))
+        columns = np.concatenate((np.arange(n), index_from))
+        data = np.concatenate((tlf * modal_density, -clf * modal_density[index_from]))
         for f in range(len(self.frequency)):
-            B = np.zeros((len(subsystems), len(subsystems)), dtype=float)
-            for j, subsystem_j in enumerate(subsystems):  # Row j
-                for i, subsystem_i in enumerate(subsystems):  # Column i
-                    loss_factor = 0.0
-                    if i == j:
-                        loss_factor = +subsystem_i.tlf[f]  # Total loss factor.
-                    else:
-                        ####Take the coupling loss factor from subsystem i to subsystem j. Negative
-                        x = list(
-                            set(subsystem_i.linked_couplings_from).intersection(
-                                set(subsystem_j.linked_couplings_to)
-                            )
-                        )
-                        if len(x) == 1:
-                            loss_factor = -x[0].clf[f]
-                        del x
-                    B[j, i] = loss_factor * subsystem_i.modal_density[f]
-            logging.info("Matrix created.")
-            yield B
+            # Duplicate entries, due to multiple couplings between the same pair of subsystems, are summed.
+            yield csc_matrix(
+                (data[:, f], (rows, columns)), shape=(n, n), dtype=self.dtype
+            )
+
+    def power_vectors(self, subsystems=None):
+        """Input power normalized with angular frequency for all frequency bands.
+
+        :param subsystems: is a list of subsystems.
+        :type subsystems: list
+        :returns: Stacked vectors with shape `(bands, subsystems)`.
+        :rtype: :class:`numpy.ndarray`
 
-    def power_vector(self, subsystems=None):
-        """Vector of input power normalized with angular frequency.
-        
         See Craik, equation 6.21, page 155
-        
-        Yields power input vectors.
+
+        Within :meth:`batch` the shape is `(samples, bands, subsystems)`.
         """
         subsystems = (
             subsystems
@@ -327,56 +612,503 @@ class System(object):
                 subsystem for subsystem in self.subsystems if subsystem.included is True
             ]
         )
+        shape = self._batch + (len(self.frequency),)
+        power_input = np.array(
+            [np.broadcast_to(subsystem.power_input, shape) for subsystem in subsystems]
+        ).reshape((len(subsystems),) + shape)
+        return np.moveaxis(power_input / self.frequency.angular, 0, -1)
 
-        for f in range(len(self.frequency)):
-            power_input = [
-                subsystem.power_input[f] / self.frequency.angular[f]
-                for subsystem in subsystems
-            ]
-            yield np.array(power_input)
+    def power_vector(self, subsystems=None):
+        """Vector of input power normalized with angular frequency.
+        
+        See Craik, equation 6.21, page 155
+        
+        Yields power input vectors.
+
+        .. seealso:: :meth:`power_vectors`
+        """
+        yield from self.power_vectors(subsystems)
 
-    def solve(self):  # Put the actual solving in a separate thread?
+    def solve(
+        self, method=None, decomposition=None, **options
+    ):  # Put the actual solving in a separate thread?
         """Solve modal powers.
         
+        :param method: Solver to use. See :attr:`seapy.solvers.solvers_map`. By default `'batched'`, or `'mixed'` in single :attr:`precision`.
+        :type method: str
+        :param decomposition: Decomposition of the model. Use `'blocks'` to solve every block of :meth:`blocks` separately.
+        :type decomposition: str
+        :param options: Options specific to the solver.
         :rtype: :func:`bool`
         
         This method solves the modal energies for every subsystem.
+        By default the enabled frequency bands are solved together with :func:`seapy.solvers.solve_batched`.
+        The model is restricted to the enabled bands with :meth:`select` before assembling, so
+        disabled bands are neither assembled nor solved. Their modal energies are zero.
+
+        When the model consists of several blocks of subsystems that are not coupled to each other,
+        solving the blocks separately is cheaper than solving the model as a whole.
+        The modal energies of a block that cannot be solved, e.g. because it contains an undamped subsystem,
+        are set to NaN and a warning is given, while the other blocks are solved as usual.
         
-        .. seealso:: :meth:`power_vector` and :meth:`power_balance_matrix`
+        .. seealso:: :meth:`power_vectors` and :meth:`power_balance_matrices`
         
         """
         logging.info("Solving system...")
 
+        if method is None:
+            method = "mixed" if self.precision == "single" else "batched"
+        try:
+            solver = solvers_map[method]
+        except KeyError:
+            raise ValueError("Solver does not exist. Cannot solve system.")
+        if self._batch and method != "batched":
+            raise ValueError("Only the batched solver can solve samples. See batch.")
+
         self.clean()
 
         subsystems = [
             subsystem for subsystem in self.subsystems if subsystem.included is True
         ]
-
-        for f, (p, B) in enumerate(
-            zip(self.power_vector(subsystems), self.power_balance_matrix(subsystems))
-        ):
-            if self.frequency.enabled[f]:
-                # try:
-                modal_energy = np.linalg.solve(
-                    B, p
-                )  # Left division results in the modal energies.
-                # except np.linalg.linalg.LinAlgError as e:   # If there is an error solving the matrix, then quit right away.
-                # warnings.warn( repr(e) )
-                # return False
-                for i, subsystem in enumerate(subsystems):
-                    subsystem.modal_energy[f] = modal_energy[i]
+        if decomposition is None:
+            blocks = [subsystems]
+        elif decomposition == "blocks":
+            blocks = self.blocks(subsystems)
+        else:
+            raise ValueError("Decomposition does not exist. Cannot solve system.")
+
+        keys = {tuple(subsystem.name for subsystem in block) for block in blocks}
+        for key in set(self._inverse).difference(keys):
+            del self._inverse[key]
+
+        enabled = self.frequency.enabled.copy()
+        results = []
+        with self.select(enabled):
+            for block in blocks:
+                if decomposition is None:
+                    results.append(solver(self, block, **options))
+                    continue
+                logging.info("Solving block of %d subsystems...", len(block))
+                try:
+                    results.append(solver(self, block, **options))
+                except (np.linalg.LinAlgError, RuntimeError) as error:
+                    warnings.warn(
+                        "Cannot solve block {}: {}".format(
+                            [subsystem.name for subsystem in block], error
+                        )
+                    )
+                    results.append(
+                        np.full((len(block),) + self._batch + (enabled.sum(),), np.nan)
+                    )
+        rows = {subsystem.name: row for row, subsystem in enumerate(self.subsystems)}
+        for block, energies in zip(blocks, results):
+            block = [rows[subsystem.name] for subsystem in block]
+            index = np.ix_(block, np.flatnonzero(enabled))
+            self._modal_energies[(Ellipsis,) + index] = np.moveaxis(
+                np.asarray(energies).reshape(
+                    (len(block),) + self._batch + (int(enabled.sum()),)
+                ),
+                0,
+                -2,
+            )
 
         self.solved = True
         logging.info("System solved.")
         return True
 
+    def blocks(self, subsystems=None):
+        """Blocks of subsystems that are not coupled to each other.
+
+        :param subsystems: is a list of subsystems. By default the included subsystems.
+        :type subsystems: list
+        :returns: List of blocks. Every block is a list of subsystems.
+        :rtype: list
+
+        The blocks are the weakly connected components of the graph of included couplings,
+        see :func:`seapy.tools.graph_couplings`. The power balance matrix is block-diagonal
+        when the subsystems are ordered per block, so every block can be solved separately.
+        Subsystems keep their order within a block, and the blocks are ordered by their first subsystem.
+
+        """
+        subsystems = (
+            subsystems
+            if subsystems
+            else [
+                subsystem for subsystem in self.subsystems if subsystem.included is True
+            ]
+        )
+        position = {subsystem.name: i for i, subsystem in enumerate(subsystems)}
+        graph = graph_couplings(self, included=True).subgraph(position)
+        components = (
+            sorted(position[name] for name in component)
+            for component in nx.weakly_connected_components(graph)
+        )
+        return [
+            [subsystems[i] for i in component]
+            for component in sorted(components, key=lambda component: component[0])
+        ]
+
+    def _affected(self, obj):
+        """Names of the subsystems whose column of the power balance matrix depends on `obj`.
+
+        :param obj: Object.
+        :rtype: set
+
+        A column contains the loss factors of the couplings from a subsystem. Changing a subsystem therefore
+        also changes the columns of the subsystems coupled to it. Excitations do not affect any column.
+
+        """
+        names = set()
+
+        def add(subsystem):
+            names.add(subsystem.name)
+            for coupling in subsystem.linked_couplings_to:
+                names.add(coupling.subsystem_from.name)
+
+        if obj.SORT == "Subsystem":
+            add(obj)
+        elif obj.SORT == "Coupling":
+            names.add(obj.subsystem_from.name)
+        elif obj.SORT == "Junction":
+            for coupling in obj.linked_couplings:
+                names.add(coupling.subsystem_from.name)
+        elif obj.SORT == "Component":
+            for subsystem in obj.linked_subsystems:
+                add(subsystem)
+        elif obj.SORT == "Material":
+            for component in obj.linked_components:
+                for subsystem in component.linked_subsystems:
+                    add(subsystem)
+        return names
+
+    def _changed(self, obj, bands=None):
+        """Register that `obj` changed.
+
+        :param obj: Object that changed.
+        :param bands: Boolean array indicating the frequency bands that changed. By default all bands.
+
+        This method is called by :class:`seapy.base.Attribute`, :class:`seapy.base.Link` and
+        :attr:`seapy.base.Base.enabled` whenever an object changes. The affected columns and bands are
+        collected until the next incremental solve, see :func:`seapy.solvers.solve_incremental`.
+        If the affected columns cannot be determined, for example while an object is being created,
+        the whole model is marked as changed.
+
+        """
+        index = self.frequency.index if bands is None else self.frequency.index[bands]
+        try:
+            names = self._affected(obj)
+        except (AttributeError, KeyError, ValueError, ReferenceError):
+            self._changed_structure = True
+            return
+        for name in names:
+            self._changes.setdefault(name, set()).update(index.tolist())
+
+    def solve_incremental(self, changed=()):
+        """Solve modal energies after a change of only a few objects.
+
+        :param changed: Iterable with objects, or names of objects, that changed without being tracked.
+        :rtype: :func:`bool`
+
+        Changes made by assigning attributes, changing links or enabling and disabling objects are tracked automatically.
+        Objects that were changed in another way, e.g. by modifying an array in-place, can be passed with `changed`.
+
+        .. seealso:: :func:`seapy.solvers.solve_incremental`
+
+        """
+        for obj in changed:
+            self._changed(self.get_object(obj))
+        return self.solve(method="incremental")
+
+    def solve_cases(self, power, subsystems=None):
+        """Solve modal energies for multiple load cases.
+
+        :param power: Input power with shape `(subsystems, cases, bands)`.
+        :type power: :class:`numpy.ndarray`
+        :param subsystems: is a list of subsystems. By default the included subsystems.
+        :type subsystems: list
+        :returns: Modal energies with shape `(subsystems, cases, bands)`.
+        :rtype: :class:`numpy.ndarray`
+
+        The power balance matrix of every enabled band is assembled and factorized only once,
+        after which all cases are back-substituted together. Disabled bands are zero.
+
+        Contrary to :meth:`solve` the modal energies of the subsystems are not modified.
+
+        """
+        subsystems = (
+            subsystems
+            if subsystems
+            else [
+                subsystem for subsystem in self.subsystems if subsystem.included is True
+            ]
+        )
+        enabled = self.frequency.enabled.copy()
+
+        power = np.asarray(power, dtype=float)
+        if power.ndim != 3 or power.shape[::2] != (len(subsystems), len(self.frequency)):
+            raise ValueError("Invalid shape of power. Cannot solve cases.")
+
+        # Stack of right-hand sides with shape (bands, subsystems, cases).
+        p = np.moveaxis(power / self.frequency.angular, -1, 0)[enabled]
+        with self.select(enabled):
+            B = self.power_balance_matrices(subsystems)
+
+        energies = np.zeros(power.shape)
+        if B.size:
+            energies[..., enabled] = np.moveaxis(np.linalg.solve(B, p), 0, -1)
+        return energies
+
+    def influence(self, receivers=None, sources=None):
+        """Energy in subsystems per unit of input power in other subsystems.
+
+        :param receivers: Name of a subsystem or list of names. By default the included subsystems.
+        :param sources: Name of a subsystem or list of names. By default the included subsystems.
+        :returns: Influence coefficients in joule per watt with shape `(bands, receivers, sources)`.
+            The axis of `receivers` or `sources` is dropped when it is a single name. Disabled bands are zero.
+        :rtype: :class:`numpy.ndarray`
+
+        Element `[f, j, i]` is the energy in subsystem `j` when one watt is injected in subsystem `i`,
+
+        .. math:: \\frac{n_j}{\\omega} \\left( B^{-1} \\right)_{ji}
+
+        The inverse of the power balance matrices is cached on the system and kept up to date with the changes
+        of the model, see :func:`seapy.solvers.cached_inverse`. Querying entries, rows or columns therefore does not
+        solve the model again. Excitations do not affect the inverse, so after changing only excitations
+        ``solve(method="incremental")`` costs a matrix-vector product per band.
+
+        Contrary to :meth:`solve` the modal energies of the subsystems are not modified.
+
+        """
+        if self._batch:
+            raise ValueError("Cannot compute influence coefficients of a batch.")
+
+        subsystems = [
+            subsystem for subsystem in self.subsystems if subsystem.included is True
+        ]
+        names = [subsystem.name for subsystem in subsystems]
+        rows = [
+            names.index(name)
+            for name in np.atleast_1d(names if receivers is None else receivers)
+        ]
+        columns = [
+            names.index(name)
+            for name in np.atleast_1d(names if sources is None else sources)
+        ]
+
+        enabled = self.frequency.enabled.copy()
+        with self.select(enabled):
+            inverse = cached_inverse(self, subsystems)
+            modal_density = transient._modal_densities(self, subsystems)
+            angular = self.frequency.angular
+
+        coefficients = np.zeros((len(self.frequency), len(rows), len(columns)))
+        coefficients[enabled] = (
+            inverse.inverse[:, rows][:, :, columns]
+            * modal_density[:, rows, None]
+            / angular[:, None, None]
+        )
+        if isinstance(sources, str):
+            coefficients = coefficients[..., 0]
+        if isinstance(receivers, str):
+            coefficients = coefficients[:, 0]
+        return coefficients
+
+    def solve_transient(self, time, schedule=1.0, initial=None, subsystems=None):
+        """Solve the energies of the subsystems as function of time.
+
+        :param time: Increasing time instants in seconds.
+        :type time: :class:`numpy.ndarray`
+        :param schedule: Factor with which the input power is multiplied, per time instant and optionally per subsystem.
+            Its shape is broadcast to `(time, subsystems)`. The factor applies until the next instant.
+        :param initial: Energies at the first instant with shape `(bands, subsystems)`.
+            With `'steady'` the steady-state energies for the full input power are used. By default zero.
+        :param subsystems: is a list of subsystems. By default the included subsystems.
+        :type subsystems: list
+        :returns: Energies with shape `(time, bands, subsystems)`.
+        :rtype: :class:`numpy.ndarray`
+
+        A source is switched on and off with `schedule`, e.g. the decay of the energies after
+        switching off all sources is obtained with
+
+        .. code-block:: python
+
+            time = np.linspace(0.0, 2.0, 201)
+            energies = system.solve_transient(time, schedule=0.0, initial="steady")
+
+        Disabled bands are zero. Contrary to :meth:`solve` the modal energies of the subsystems are not modified.
+
+        .. seealso:: :func:`seapy.transient.integrate`
+
+        """
+        subsystems = (
+            subsystems
+            if subsystems
+            else [
+                subsystem for subsystem in self.subsystems if subsystem.included is True
+            ]
+        )
+        enabled = self.frequency.enabled.copy()
+
+        time = np.asarray(time, dtype=float)
+        n = len(subsystems)
+        schedule = np.asarray(schedule, dtype=float)
+        if schedule.ndim == 1:
+            schedule = schedule[:, None]
+        try:
+            schedule = np.broadcast_to(schedule, (len(time), n))
+        except ValueError:
+            raise ValueError("Invalid shape of schedule. Cannot solve transient.")
+
+        with self.select(enabled):
+            power = self.power_vectors(subsystems) * self.frequency.angular[:, None]
+            if initial is None:
+                initial = np.zeros(power.shape)
+            elif isinstance(initial, str) and initial == "steady":
+                initial = transient.steady(self, subsystems)
+            else:
+                initial = np.asarray(initial, dtype=float)[enabled]
+            energies = transient.integrate(
+                self, subsystems, time, schedule[:, None, :] * power, initial
+            )
+
+        result = np.zeros((len(time), len(enabled), n))
+        result[:, enabled] = energies
+        return result
+
+    @contextlib.contextmanager
+    def select(self, bands):
+        """Restrict the model temporarily to a selection of frequency bands.
+
+        :param bands: Boolean array or indices of the frequency bands to select.
+
+        Within the context :attr:`frequency` is replaced by :meth:`Frequency.select` and every
+        :class:`seapy.base.Attribute` of every object by its values in the selected bands.
+        All properties are therefore evaluated only for the selected bands.
+        Values assigned within the context are discarded when leaving it.
+        Properties that depend on whether an attribute is specified at all, e.g.
+        :attr:`seapy.subsystems.subsystem.Subsystem.dlf`, still consider all bands,
+        see :meth:`seapy.base.Base._specified`.
+
+        .. code-block:: python
+
+            with system.select(system.frequency.center >= 1000.0):
+                system.info(system.subsystems, "tlf")
+
+        """
+        frequency = self.frequency
+        bands = np.arange(len(frequency))[bands]
+        if len(bands) == len(frequency):
+            yield
+            return
+
+        spectra = list(self._spectra())
+        self._update_modal_energies()
+        modal_energies = self._modal_energies
+        specified = self._specified
+        # Within nested selections the outermost values determine whether an attribute is specified.
+        self._specified = {
+            (attributes["name"], key): bool(values.any())
+            for attributes, key, values in spectra
+        }
+        self._specified.update(specified)
+        self.__dict__["frequency"] = frequency.select(bands)
+        for attributes, key, values in spectra:
+            attributes[key] = values[..., bands]
+        self._bind_modal_energies(modal_energies[..., bands])
+        try:
+            yield
+        finally:
+            self.__dict__["frequency"] = frequency
+            self._specified = specified
+            for attributes, key, values in spectra:
+                attributes[key] = values
+            self._bind_modal_energies(modal_energies)
+
+    def _spectra(self):
+        """Every :class:`seapy.base.Attribute` of every object.
+
+        Yields tuples `(attributes, key, values)` where `attributes` is the `__dict__` of the object.
+        """
+        for obj in self._objects:
+            for key in {
+                key
+                for cl in obj.__class__.__mro__
+                for key, value in cl.__dict__.items()
+                if isinstance(value, Attribute)
+            }:
+                yield obj.__dict__, key, obj.__dict__[key]
+
+    @contextlib.contextmanager
+    def batch(self, values, samples=None):
+        """Evaluate the model temporarily for many samples of some attributes at once.
+
+        :param values: Dictionary with tuples `(object, attribute)` as keys, where `object` is an object or its name,
+            and arrays with shape `(samples,)` or `(samples, bands)` as values.
+        :type values: dict
+        :param samples: Amount of samples. By default the amount of samples in `values`.
+
+        Within the context every :class:`seapy.base.Attribute` in `values` is replaced by its samples.
+        The samples are an extra leading axis that is broadcast through all properties, such as the coupling loss factors
+        and modal densities, and through the assembly of the power balance. :meth:`solve` with the batched solver
+        solves all samples at once, after which e.g. :attr:`seapy.subsystems.subsystem.Subsystem.pressure_level`
+        has shape `(samples, bands)`. The model and its results are restored when leaving the context.
+
+        .. code-block:: python
+
+            with system.batch({("concrete", "loss_factor"): np.linspace(0.01, 0.05, 5)}):
+                system.solve(method="batched")
+                levels = system.get_object("room2_SubsystemLong").pressure_level
+
+        """
+        values = [
+            (self.get_object(obj), attribute, np.asarray(samples, dtype=float))
+            for (obj, attribute), samples in values.items()
+        ]
+        amounts = {len(value) for _, _, value in values}
+        if samples is not None:
+            amounts.add(samples)
+        if len(amounts) > 1:
+            raise ValueError("All attributes should have the same amount of samples.")
+        shape = (amounts.pop() if amounts else 1, len(self.frequency))
+
+        varied = []
+        for obj, attribute, value in values:
+            if not isinstance(getattr(obj.__class__, attribute, None), Attribute):
+                raise ValueError(
+                    "{} is not an attribute of {}.".format(attribute, obj.name)
+                )
+            if value.ndim == 1:
+                value = value[:, None]
+            try:
+                value = np.array(np.broadcast_to(value, shape))
+            except ValueError:
+                raise ValueError("Invalid shape of samples of {}.".format(attribute))
+            varied.append((obj.__dict__, attribute, value))
+
+        spectra = [
+            (attributes, key, attributes[key]) for attributes, key, _ in varied
+        ]
+        self._update_modal_energies()
+        modal_energies = self._modal_energies
+        solved, self._batch = self.solved, shape[:1]
+        for attributes, key, value in varied:
+            attributes[key] = value
+        # The results need to have room for every sample as well.
+        self._allocate_modal_energies()
+        try:
+            yield
+        finally:
+            self.solved, self._batch = solved, ()
+            for attributes, key, value in spectra:
+                attributes[key] = value
+            self._bind_modal_energies(modal_energies)
+
     def clean(self):
         """Clear the results. Reset modal energies. Set :attr:`solved` to False.
         """
         logging.info("Clearing results...")
-        for subsystem in self.subsystems:
-            subsystem.modal_energy = 0.0
+        self._update_modal_energies()
+        self._modal_energies[...] = 0.0
         self.solved = False
         logging.info("Cleared results.")
 
@@ -421,7 +1153,7 @@ class System(object):
             data["frequency"]["upper"],
             data["frequency"]["enabled"],
         )
-        system = cls(frequency)
+        system = cls(frequency, precision=data.get("precision", "double"))
         system.solved = data["solved"]
 
         for sort in _OBJECTS:
@@ -469,6 +1201,7 @@ class System(object):
             5. :atrr:`couplings`
             6. :attr:`excitations`
         * The attribute :attr:`solved`.
+        * The attribute :attr:`precision`.
         * Frequency object. 
         
         """
@@ -476,6 +1209,7 @@ class System(object):
         for sort in _OBJECTS:
             data[sort] = [obj._save() for obj in getattr(self, sort)]
         data["solved"] = self.solved
+        data["precision"] = self.precision
         data["frequency"] = self.frequency._save()
         return data
 
@@ -540,6 +1274,7 @@ class Frequency(object):
         self.__dict__["upper"] = np.array(upper)
         self.__dict__["enabled"] = np.ones_like(self.center, dtype="bool")
         self.enabled = enabled
+        self.__dict__["index"] = np.arange(len(self.center))
 
     def __len__(self):
         return len(self.center)
@@ -596,6 +1331,28 @@ class Frequency(object):
     def enabled(self, x):
         self.__dict__["enabled"][:] = x
 
+    @property
+    def index(self):
+        """Indices of the bands in the complete set of frequency bands.
+
+        .. seealso:: :meth:`select`
+        """
+        return self.__dict__["index"]
+
+    def select(self, bands):
+        """Selection of frequency bands.
+
+        :param bands: Boolean array or indices of the bands to select.
+        :returns: Frequency object with only the selected bands.
+
+        The :attr:`index` of the selection refers to the bands of this object.
+        """
+        obj = Frequency(
+            self.center[bands], self.lower[bands], self.upper[bands], self.enabled[bands]
+        )
+        obj.__dict__["index"] = self.index[bands]
+        return obj
+
     @classmethod
     def from_frequencies(cls, obj):
         """From :class:`seapy.Frequencies`.
@@ -95,16 +95,25 @@ ATTRIBUTES = {
 # pass
 
 
-def graph_couplings(system):
+def graph_couplings(system, included=False):
     """Graph with subsystems as nodes and couplings as edges.
+
+    :param system: System
+    :param included: Only subsystems and couplings that are included in the analysis.
     """
 
     G = nx.DiGraph()
 
-    nodes = (obj.name for obj in system.subsystems)
+    subsystems = system.subsystems
+    couplings = system.couplings
+    if included:
+        subsystems = (obj for obj in subsystems if obj.included is True)
+        couplings = (obj for obj in couplings if obj.included is True)
+
+    nodes = (obj.name for obj in subsystems)
     edges = (
         (obj.subsystem_from.name, obj.subsystem_to.name, {"name": obj.name})
-        for obj in system.couplings
+        for obj in couplings
     )
 
     G.add_nodes_from(nodes)
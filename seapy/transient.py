@@ -0,0 +1,300 @@
+"""
+Transient
+=========
+
+The power balance of a :class:`seapy.system.System` also describes how the energies of the subsystems change over time.
+The energies :math:`E` of the subsystems in a frequency band satisfy
+
+.. math:: \\frac{\\mathrm{d} E}{\\mathrm{d} t} = - \\omega L E + P
+
+where :math:`L` is the matrix of loss factors and :math:`P` the input power.
+Column :math:`i` of :math:`L` is column :math:`i` of the power balance matrix divided by the modal density of subsystem :math:`i`,
+see :meth:`seapy.system.System.power_balance_matrices`.
+
+.. autofunction:: seapy.transient.loss_factor_matrices
+.. autofunction:: seapy.transient.steady
+.. autofunction:: seapy.transient.integrate
+
+.. autoclass:: seapy.transient.Decay
+
+
+"""
+
+import logging
+import numpy as np
+import pandas as pd
+
+from .subsystems.subsystemacoustical import SubsystemAcoustical
+
+
+def _modal_densities(system, subsystems):
+    """Modal densities with shape `(bands, subsystems)`."""
+    shape = (len(system.frequency),)
+    return (
+        np.array(
+            [
+                np.broadcast_to(subsystem.modal_density, shape)
+                for subsystem in subsystems
+            ]
+        )
+        .reshape((len(subsystems),) + shape)
+        .T
+    )
+
+
+def loss_factor_matrices(system, subsystems):
+    """Loss factor matrices :math:`L` of all frequency bands.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :returns: Stacked matrices with shape `(bands, subsystems, subsystems)`.
+
+    Element `[f, j, i]` is minus the coupling loss factor from subsystem `i` to subsystem `j`.
+    The diagonal contains the total loss factors.
+
+    """
+    B = system.power_balance_matrices(subsystems).astype(np.float64)
+    return B / _modal_densities(system, subsystems)[:, None, :]
+
+
+def steady(system, subsystems):
+    """Steady-state energies of the subsystems.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :returns: Energies with shape `(bands, subsystems)`.
+
+    These are the energies for which the derivative vanishes, i.e. the solution of :meth:`seapy.system.System.solve`.
+
+    """
+    B = system.power_balance_matrices(subsystems).astype(np.float64)
+    p = system.power_vectors(subsystems)
+    if not B.size:
+        return np.zeros(p.shape)
+    modal_energy = np.linalg.solve(B, p[..., None])[..., 0]
+    return modal_energy * _modal_densities(system, subsystems)
+
+
+def integrate(system, subsystems, time, power, initial):
+    """Integrate the energies of the subsystems over time.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param subsystems: List of subsystems.
+    :param time: Increasing time instants with shape `(time,)`.
+    :param power: Input power with shape `(time, bands, subsystems)`.
+    :param initial: Energies at the first instant with shape `(bands, subsystems)`.
+    :returns: Energies with shape `(time, bands, subsystems)`.
+
+    The input power is constant between two instants, so a source can be switched on and off at any instant.
+    Between two instants the equation is then solved exactly with the matrix exponential.
+    For every distinct time step the exponentials of all bands are computed at once with :func:`scipy.linalg.expm`
+    of the augmented matrix
+
+    .. math:: \\begin{bmatrix} A h & I h \\\\ 0 & 0 \\end{bmatrix}
+
+    with :math:`A = - \\omega L`, whose upper blocks are the propagators of the energies and of the input power.
+    The integration is unconditionally stable, however stiff the loss factor matrices are.
+
+    This function requires :mod:`scipy`.
+
+    """
+    from scipy.linalg import expm
+
+    time = np.asarray(time, dtype=float)
+    steps = np.diff(time)
+    if time.ndim != 1 or (steps < 0.0).any():
+        raise ValueError("Time instants should be increasing.")
+
+    A = -system.frequency.angular[:, None, None] * loss_factor_matrices(
+        system, subsystems
+    )
+    bands, n = A.shape[:2]
+
+    propagators = dict()
+    for h in np.unique(steps):
+        augmented = np.zeros((bands, 2 * n, 2 * n))
+        augmented[:, :n, :n] = A * h
+        augmented[:, :n, n:] = np.eye(n) * h
+        exponential = expm(augmented) if bands and n else augmented
+        propagators[h] = (exponential[:, :n, :n], exponential[:, :n, n:])
+    logging.info("Computed propagators for %d time steps.", len(propagators))
+
+    energies = np.zeros((len(time), bands, n))
+    energies[0] = initial
+    for k, h in enumerate(steps):
+        energy, source = propagators[h]
+        energies[k + 1] = (
+            energy @ energies[k][..., None] + source @ power[k][..., None]
+        )[..., 0]
+    return energies
+
+
+class Decay(object):
+    """Free decay of the energies of the subsystems.
+
+    Without input power the energies decay as
+
+    .. math:: E(t) = V \\mathrm{e}^{- \\Lambda t} V^{-1} E(0)
+
+    where the columns of :math:`V` are the eigenvectors of :math:`\\omega L` and
+    :math:`\\Lambda` is the diagonal matrix with the decay rates, i.e. the eigenvalues.
+    The loss factor matrices of all bands are decomposed once with :func:`numpy.linalg.eig`.
+    Every following decay curve or impulse response only scales the eigenvectors.
+
+    The decomposition applies to the enabled bands and the subsystems at the moment of construction.
+    Construct a new object after changing the model.
+
+    """
+
+    def __init__(self, system, subsystems=None):
+        """Constructor.
+
+        :param system: System
+        :type system: :class:`seapy.system.System`
+        :param subsystems: List of subsystems. By default the included subsystems.
+        """
+        subsystems = (
+            subsystems
+            if subsystems
+            else [
+                subsystem
+                for subsystem in system.subsystems
+                if subsystem.included is True
+            ]
+        )
+
+        self.subsystems = [subsystem.name for subsystem in subsystems]
+        """Names of the subsystems.
+        """
+
+        self._acoustical = [
+            i
+            for i, subsystem in enumerate(subsystems)
+            if isinstance(subsystem, SubsystemAcoustical)
+        ]
+
+        with system.select(system.frequency.enabled.copy()):
+            self.center = system.frequency.center.copy()
+            """Center frequencies of the bands.
+            """
+
+            self.initial = steady(system, subsystems)
+            """Steady-state energies with shape `(bands, subsystems)`. Default initial energies of the decay.
+            """
+
+            L = system.frequency.angular[:, None, None] * loss_factor_matrices(
+                system, subsystems
+            )
+
+        rates, vectors = np.linalg.eig(L)
+        order = np.argsort(rates.real, axis=-1)
+        self.rates = np.real_if_close(np.take_along_axis(rates, order, axis=-1))
+        """Decay rates in 1/s with shape `(bands, modes)`, in increasing order.
+
+        The energies decay with :math:`\\mathrm{e}^{- \\lambda t}`, where :math:`\\lambda` is a decay rate.
+        """
+
+        self._vectors = np.real_if_close(
+            np.take_along_axis(vectors, order[:, None, :], axis=-1)
+        )
+        self._inverse = np.linalg.inv(self._vectors)
+
+    @property
+    def sharing(self):
+        """Energy-sharing vectors with shape `(bands, subsystems, modes)`.
+
+        Column `m` contains the relative energies of the subsystems in the mode that decays with :attr:`rates` `m`.
+        The absolute values of a column sum to one and the largest value is positive.
+        The slowest mode has only positive values and describes how the energy is distributed at the end of a decay.
+        """
+        vectors = self._vectors.real
+        largest = np.take_along_axis(
+            vectors, np.abs(vectors).argmax(axis=1)[:, None, :], axis=1
+        )
+        return vectors * np.sign(largest) / np.abs(vectors).sum(axis=1, keepdims=True)
+
+    def energies(self, time, initial=None):
+        """Energies during the decay.
+
+        :param time: Time instants in seconds. Either with shape `(time,)` or `(time, bands)`.
+        :param initial: Energies at time zero with shape `(bands, subsystems)`. By default :attr:`initial`.
+        :returns: Energies with shape `(time, bands, subsystems)`.
+
+        """
+        initial = self.initial if initial is None else np.asarray(initial)
+        time = np.asarray(time, dtype=float)
+        if time.ndim == 1:
+            time = time[:, None]
+        coefficients = (self._inverse @ initial[..., None])[..., 0]
+        scaling = np.exp(-self.rates * time[..., None]) * coefficients
+        return np.einsum("fsm,tfm->tfs", self._vectors, scaling).real
+
+    def impulse_response(self, time, subsystem):
+        """Energies after a unit of energy is injected in `subsystem` at time zero.
+
+        :param time: Time instants in seconds.
+        :param subsystem: Name of the subsystem.
+        :returns: Energies with shape `(time, bands, subsystems)`.
+
+        """
+        initial = np.zeros(self.initial.shape)
+        initial[:, self.subsystems.index(subsystem)] = 1.0
+        return self.energies(time, initial)
+
+    def reverberation_time(
+        self, initial=None, start=-5.0, stop=-35.0, samples=1000, extensions=10
+    ):
+        """Reverberation time of the acoustical subsystems.
+
+        :param initial: Energies at time zero with shape `(bands, subsystems)`. By default :attr:`initial`.
+        :param start: Level in decibel relative to the initial level where the evaluation of the decay starts.
+        :param stop: Level in decibel relative to the initial level where the evaluation of the decay stops.
+        :param samples: Amount of time instants per band at which the decay curves are evaluated.
+        :param extensions: Maximum amount of times the evaluated duration is doubled in a band
+            when a decay curve does not reach `stop`.
+        :returns: Reverberation times in seconds. The index contains the center frequencies and the columns the subsystems.
+        :rtype: :class:`pandas.DataFrame`
+
+        The reverberation time is the time in which the energy would decay by 60 decibel,
+        extrapolated from the time the decay curve takes to drop from `start` to `stop`.
+        With the default levels this is :math:`T_{30}`.
+        The decay of a coupled subsystem is not exponential, so the result depends on `start` and `stop`.
+        The reverberation time is NaN where a decay curve does not reach `stop`.
+
+        """
+        initial = self.initial if initial is None else np.asarray(initial)
+
+        # The slowest decay determines how long it takes to reach `stop`. A coupled subsystem that still receives
+        # energy lags behind, so the duration is doubled in the bands where a decay curve does not reach `stop` yet.
+        duration = np.log(10.0 ** ((10.0 - stop) / 10.0)) / self.rates.real.min(axis=-1)
+        for _ in range(extensions + 1):
+            time = np.linspace(0.0, 1.0, samples)[:, None] * duration
+            levels = 10.0 * np.log10(
+                self.energies(time, initial)[..., self._acoustical]
+                / initial[..., self._acoustical]
+            )
+            crossed = (levels <= stop).any(axis=0).all(axis=-1)
+            if crossed.all():
+                break
+            duration = np.where(crossed, duration, 2.0 * duration)
+
+        def crossing(level):
+            """Time at which the levels drop below `level` for the first time. NaN if they do not."""
+            below = levels <= level
+            k = np.maximum(np.argmax(below, axis=0), 1)
+            before = np.take_along_axis(levels, k[None] - 1, axis=0)[0]
+            after = np.take_along_axis(levels, k[None], axis=0)[0]
+            t0 = np.take_along_axis(time[..., None], k[None] - 1, axis=0)[0]
+            t1 = np.take_along_axis(time[..., None], k[None], axis=0)[0]
+            t = t0 + (t1 - t0) * (before - level) / (before - after)
+            return np.where(below.any(axis=0), t, np.nan)
+
+        reverberation_time = 60.0 / (start - stop) * (crossing(stop) - crossing(start))
+        return pd.DataFrame(
+            reverberation_time,
+            index=self.center,
+            columns=[self.subsystems[i] for i in self._acoustical],
+        )
@@ -0,0 +1,113 @@
+"""
+Uncertainty
+===========
+
+The input of an SEA model, e.g. loss factors, material properties and dimensions, is often uncertain.
+This module propagates that uncertainty to the results with Monte Carlo simulations.
+All samples are evaluated at once, see :meth:`seapy.system.System.batch`.
+
+.. autofunction:: seapy.uncertainty.monte_carlo
+
+"""
+
+import logging
+import warnings
+import numpy as np
+import pandas as pd
+
+
+def _draw(distribution, samples, random_state):
+    """Draw `samples` from `distribution`.
+
+    :param distribution: Frozen distribution of :mod:`scipy.stats` or a callable `distribution(random_state, samples)`.
+    :param random_state: Generator.
+    :type random_state: :class:`numpy.random.Generator`
+    """
+    if hasattr(distribution, "rvs"):
+        return distribution.rvs(size=samples, random_state=random_state)
+    return distribution(random_state, samples)
+
+
+def monte_carlo(
+    system,
+    distributions,
+    samples=1000,
+    quantities=("pressure_level", "velocity_level"),
+    percentiles=(5.0, 50.0, 95.0),
+    seed=None,
+):
+    """Percentiles of quantities of the subsystems when attributes are uncertain.
+
+    :param system: System
+    :type system: :class:`seapy.system.System`
+    :param distributions: Dictionary with tuples `(object, attribute)` as keys, where `object` is an object or its name,
+        and distributions as values. A distribution is either a frozen distribution of :mod:`scipy.stats`
+        or a callable `distribution(random_state, samples)` returning an array with shape `(samples,)` or `(samples, bands)`.
+    :type distributions: dict
+    :param samples: Amount of samples.
+    :param quantities: Names of the quantities of the subsystems, e.g. `pressure_level` and `velocity_level`.
+        Subsystems that do not have a quantity are skipped.
+    :param percentiles: Percentiles to compute.
+    :param seed: Seed of the random number generator, see :func:`numpy.random.default_rng`.
+    :returns: Percentiles. The index contains the quantity, the name of the subsystem and the percentile,
+        and the columns the center frequencies.
+    :rtype: :class:`pandas.DataFrame`
+
+    The samples of all attributes are drawn independently. All samples are solved with a single batched solve,
+    instead of creating and solving a model per sample.
+    Samples for which a quantity is NaN, e.g. the level of a negative energy, are ignored in the bands
+    where they are NaN and a warning states how many samples were affected.
+    In disabled bands the modal energies are zero.
+
+    .. code-block:: python
+
+        from scipy.stats import norm, uniform
+
+        monte_carlo(
+            system,
+            {
+                ("concrete", "loss_factor"): uniform(0.01, 0.03),
+                ("wall", "height"): norm(0.05, 0.002),
+            },
+        )
+
+    """
+    random_state = np.random.default_rng(seed)
+    values = {
+        key: _draw(distribution, samples, random_state)
+        for key, distribution in distributions.items()
+    }
+    logging.info("Solving %d samples...", samples)
+
+    data = dict()
+    with system.batch(values):
+        system.solve(method="batched")
+        for subsystem in system.subsystems:
+            if subsystem.included is not True:
+                continue
+            for quantity in quantities:
+                if hasattr(subsystem, quantity):
+                    results = np.broadcast_to(
+                        getattr(subsystem, quantity), (samples, len(system.frequency))
+                    )
+                    invalid = np.isnan(results)
+                    if invalid.any():
+                        warnings.warn(
+                            "Ignoring {} of {} samples of {} of {} that are NaN.".format(
+                                invalid.any(axis=1).sum(),
+                                samples,
+                                quantity,
+                                subsystem.name,
+                            )
+                        )
+                    for percentile, result in zip(
+                        percentiles, np.nanpercentile(results, percentiles, axis=0)
+                    ):
+                        data[(quantity, subsystem.name, percentile)] = result
+
+    index = pd.MultiIndex.from_tuples(
+        list(data), names=["quantity", "subsystem", "percentile"]
+    )
+    return pd.DataFrame(
+        list(data.values()), index=index, columns=system.frequency.center
+    )
@@ -0,0 +1,64 @@
+"""
+Fixtures shared by the tests.
+"""
+
+from acoustics.signal import OctaveBand
+import seapy
+
+import pytest
+
+
+@pytest.fixture
+def system():
+    """Two rooms separated by a concrete wall, excited in the first room."""
+    frequency = OctaveBand(fstart=20.0, fstop=4000.0, fraction=1)
+    system = seapy.system.System(frequency)
+    system.add_material(
+        "air",
+        "MaterialGas",
+        density=1.296,
+        temperature=293.0,
+        bulk=1.01e5,
+        loss_factor=0.05,
+    )
+    system.add_material(
+        "concrete",
+        "MaterialSolid",
+        young=3.0e10,
+        poisson=0.15,
+        density=2.3e3,
+        loss_factor=0.02,
+        shear=1.3e10,
+    )
+    room1 = system.add_component(
+        "room1",
+        "Component3DAcoustical",
+        material="air",
+        length=4.0,
+        height=2.5,
+        width=5.0,
+    )
+    system.add_component(
+        "room2",
+        "Component3DAcoustical",
+        material="air",
+        length=5.0,
+        height=2.5,
+        width=5.0,
+    )
+    system.add_component(
+        "wall",
+        "Component2DPlate",
+        material="concrete",
+        length=3.0,
+        width=2.5,
+        height=0.05,
+    )
+    junction = system.add_junction(
+        "junction1", "Junction", shape="Surface", components=["room1", "room2", "wall"]
+    )
+    junction.update_couplings()
+    room1.subsystem_long.add_excitation(
+        "excitation1", "ExcitationPointVolume", velocity=0.001, radius=0.05
+    )
+    return system
@@ -0,0 +1,75 @@
+"""
+Tests for the estimation of loss factors from measurements.
+"""
+
+import numpy as np
+import pytest
+
+from seapy.experimental import power_injection
+
+
+def measure(system):
+    """Energies when a watt is injected in every subsystem in turn."""
+    subsystems = [
+        subsystem for subsystem in system.subsystems if subsystem.included is True
+    ]
+    n = len(subsystems)
+    power = np.repeat(np.eye(n)[..., None], len(system.frequency), axis=-1)
+    modal_energy = system.solve_cases(power)
+    modal_density = np.array([subsystem.modal_density for subsystem in subsystems])
+    return subsystems, power, modal_energy * modal_density[:, None, :]
+
+
+class TestPowerInjection:
+    @pytest.mark.parametrize("nonnegative", [False, True])
+    def test_power_injection(self, system, nonnegative):
+        subsystems, power, energy = measure(system)
+        expected = {subsystem.name: subsystem.dlf.copy() for subsystem in subsystems}
+        expected.update(
+            {
+                coupling.name: coupling.clf.copy()
+                for coupling in system.couplings
+                if coupling.included
+            }
+        )
+
+        result = power_injection(system, power, energy, nonnegative=nonnegative)
+        assert set(result.index) == set(expected)
+        # Coupling loss factors that are tiny compared to the damping are less accurate.
+        for name, values in expected.items():
+            assert np.allclose(result.loc[name], values, rtol=1e-6, atol=1e-10)
+
+        # The estimates are assigned and reproduce the measurements.
+        for name, values in expected.items():
+            assert np.allclose(
+                system.get_object(name).loss_factor, values, rtol=1e-6, atol=1e-10
+            )
+        assert np.allclose(measure(system)[2], energy, rtol=1e-6, atol=0.0)
+
+    def test_partial_bands(self, system):
+        """Bands that are not estimated keep the loss factors of the model."""
+        subsystems, power, energy = measure(system)
+        dlf = {subsystem.name: subsystem.dlf.copy() for subsystem in subsystems}
+        clf = {coupling.name: coupling.clf.copy() for coupling in system.couplings}
+        system.solve()
+        expected = system.modal_energies.copy()
+
+        bands = system.frequency.center > 200.0
+        system.frequency.enabled = bands
+        power_injection(system, power, energy)
+        for name, values in {**dlf, **clf}.items():
+            obj = system.get_object(name)
+            assert np.array_equal(obj.loss_factor[~bands], values[~bands])
+
+        system.frequency.enabled = True
+        system.solve()
+        assert np.allclose(system.modal_energies, expected, rtol=1e-6, atol=0.0)
+
+    def test_override(self, system):
+        coupling = next(iter(system.couplings))
+        coupling.loss_factor = 0.01
+        assert np.array_equal(coupling.clf, coupling.loss_factor)
+
+    def test_invalid_shape(self, system):
+        with pytest.raises(ValueError):
+            power_injection(system, np.zeros((2, 2, 2)), np.zeros((2, 2, 2)))
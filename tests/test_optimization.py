@@ -0,0 +1,46 @@
+"""
+Tests for the optimization of treatments.
+"""
+
+import numpy as np
+
+from seapy.optimization import optimize_damping
+
+TARGET = "room2_SubsystemLong"
+
+TREATMENTS = {
+    "wall": ("wall_SubsystemBend", 0.05, 10.0),
+    "room1": ("room1_SubsystemLong", 0.05, 20.0),
+    "room2": ("room2_SubsystemLong", 0.05, 20.0),
+    "wall_shear": ("wall_SubsystemShear", 0.05, 1.0),
+}
+
+
+def level(system):
+    system.solve()
+    return 10.0 * np.log10(np.sum(system.get_object(TARGET).energy))
+
+
+class TestOptimizeDamping:
+    def test_optimize_damping(self, system):
+        result = optimize_damping(system, TARGET, TREATMENTS)
+        assert list(result.columns) == [
+            "subsystem",
+            "cost",
+            "total_cost",
+            "level",
+            "reduction",
+        ]
+        assert (result["reduction"] > 0.0).all()
+
+        # The model is not changed, so apply the treatments in order and compare.
+        for name, row in result.iterrows():
+            subsystem = system.get_object(row["subsystem"])
+            subsystem.loss_factor = subsystem.dlf + TREATMENTS[name][1]
+            assert np.isclose(level(system), row["level"])
+
+    def test_budget(self, system):
+        result = optimize_damping(system, TARGET, TREATMENTS, budget=25.0)
+        assert result["total_cost"].iloc[-1] <= 25.0
+        assert result["cost"].sum() == result["total_cost"].iloc[-1]
+        assert len(result) < len(TREATMENTS)
@@ -0,0 +1,78 @@
+"""
+Tests for the sensitivities of the results.
+"""
+
+import numpy as np
+
+import pytest
+
+from seapy.sensitivity import sensitivities
+
+pytest.importorskip("scipy")
+
+TARGET = "room2_SubsystemLong"
+
+
+def level(system, obj, attribute, value):
+    """Pressure level of the target after changing an attribute."""
+    setattr(system.get_object(obj), attribute, value)
+    system.solve()
+    return system.get_object(TARGET).pressure_level
+
+
+class TestSensitivities:
+    @pytest.mark.parametrize(
+        "obj, attribute",
+        [
+            ("concrete", "loss_factor"),
+            ("wall", "height"),
+            ("room2", "length"),
+            ("room2_SubsystemLong", "loss_factor"),
+            ("excitation1", "velocity"),
+        ],
+    )
+    def test_attribute(self, system, obj, attribute):
+        system.get_object("room2_SubsystemLong").loss_factor = 0.03
+        value = np.array(getattr(system.get_object(obj), attribute))
+
+        result = sensitivities(system, TARGET, [(obj, attribute)])
+
+        h = 1e-5 * value
+        expected = (
+            level(system, obj, attribute, value + h)
+            - level(system, obj, attribute, value - h)
+        ) / (2.0 * h)
+        assert np.allclose(
+            result.loc["{}.{}".format(obj, attribute)], expected, rtol=1e-4, atol=1e-6
+        )
+
+    def test_clf(self, system):
+        subsystems = list(system.subsystems)
+        names = [subsystem.name for subsystem in subsystems]
+        coupling = system.get_object("wall_SubsystemBend_room2_SubsystemLong")
+        i = names.index(coupling.subsystem_from.name)
+        j = names.index(coupling.subsystem_to.name)
+
+        result = sensitivities(
+            system, TARGET, [(coupling.name, "clf")], quantity="modal_energy"
+        )
+
+        B = system.power_balance_matrices()
+        p = system.power_vectors()
+        dB = np.zeros(B.shape)
+        dB[:, i, i] = subsystems[i].modal_density
+        dB[:, j, i] = -subsystems[i].modal_density
+        h = 1e-6 * coupling.clf[:, None, None]
+        expected = (
+            np.linalg.solve(B + h * dB, p[..., None])
+            - np.linalg.solve(B - h * dB, p[..., None])
+        )[:, names.index(TARGET), 0] / (2.0 * h[:, 0, 0])
+        assert np.allclose(result.loc[coupling.name + ".clf"], expected, rtol=1e-5)
+
+    def test_normalized(self, system):
+        parameters = [("concrete", "loss_factor"), ("wall", "height")]
+        result = sensitivities(system, TARGET, parameters)
+        normalized = sensitivities(system, TARGET, parameters, normalized=True)
+        assert np.allclose(
+            normalized.loc["wall.height"], result.loc["wall.height"] * 0.05
+        )
@@ -0,0 +1,507 @@
+"""
+Tests for assembling and solving the power balance of a model.
+"""
+
+import numpy as np
+
+import pytest
+
+
+def reference_matrix(subsystems, f):
+    """Power balance matrix of band `f`, element by element."""
+    B = np.zeros((len(subsystems), len(subsystems)))
+    for j, subsystem_j in enumerate(subsystems):
+        for i, subsystem_i in enumerate(subsystems):
+            if i == j:
+                loss_factor = subsystem_i.tlf[f]
+            else:
+                couplings = set(subsystem_i.linked_couplings_from).intersection(
+                    set(subsystem_j.linked_couplings_to)
+                )
+                loss_factor = -sum(coupling.clf[f] for coupling in couplings)
+            B[j, i] = loss_factor * subsystem_i.modal_density[f]
+    return B
+
+
+class TestAssembly:
+    def test_power_balance_matrices(self, system):
+        subsystems = list(system.subsystems)
+        B = system.power_balance_matrices()
+
+        assert B.shape == (len(system.frequency), len(subsystems), len(subsystems))
+        for f in range(len(system.frequency)):
+            assert np.allclose(B[f], reference_matrix(subsystems, f))
+
+    def test_power_balance_matrix(self, system):
+        B = system.power_balance_matrices()
+        for f, matrix in enumerate(system.power_balance_matrix()):
+            assert np.array_equal(matrix, B[f])
+
+    def test_power_balance_matrix_sparse(self, system):
+        pytest.importorskip("scipy")
+        B = system.power_balance_matrices()
+        for f, matrix in enumerate(system.power_balance_matrix(sparse=True)):
+            assert matrix.format == "csc"
+            assert np.allclose(matrix.toarray(), B[f])
+
+
+class TestSelect:
+    def test_select(self, system):
+        subsystem = system.get_object("wall_SubsystemBend")
+        tlf = subsystem.tlf
+        bands = system.frequency.center > 500.0
+
+        with system.select(bands):
+            assert len(system.frequency) == bands.sum()
+            assert np.array_equal(system.frequency.index, np.flatnonzero(bands))
+            assert np.allclose(subsystem.tlf, tlf[bands])
+            B = system.power_balance_matrices()
+
+        assert len(subsystem.tlf) == len(bands)
+        assert np.allclose(B, system.power_balance_matrices()[bands])
+
+    def test_partial_spectrum(self, system):
+        """Attributes specified only outside of the selection are still specified."""
+        excitation = system.get_object("excitation1")
+        excitation.velocity = np.where(system.frequency.center > 500.0, 0.001, 0.0)
+        subsystem = system.get_object("wall_SubsystemBend")
+        subsystem.loss_factor = np.where(system.frequency.center > 500.0, 0.01, 0.0)
+        power, dlf = excitation.power, subsystem.dlf
+        bands = system.frequency.center < 400.0
+
+        with system.select(bands):
+            assert np.array_equal(excitation.power, power[bands])
+            assert np.array_equal(subsystem.dlf, dlf[bands])
+
+    @pytest.mark.parametrize("method", ["dense", "batched", "sparse", "incremental"])
+    def test_solve_partial_spectrum(self, system, method):
+        excitation = system.get_object("excitation1")
+        excitation.velocity = np.where(system.frequency.center > 500.0, 0.001, 0.0)
+        system.frequency.enabled = system.frequency.center < 400.0
+        system.solve(method=method)
+        assert not system.modal_energies.any()
+
+        system.frequency.enabled = False
+        system.solve(method=method)
+        assert not system.modal_energies.any()
+
+
+class TestSolve:
+    @pytest.mark.parametrize("method", ["dense", "batched", "sparse"])
+    def test_solve(self, system, method):
+        system.solve(method=method)
+        subsystems = list(system.subsystems)
+        energies = np.array([subsystem.modal_energy for subsystem in subsystems])
+
+        for f in range(len(system.frequency)):
+            B = reference_matrix(subsystems, f)
+            p = [
+                subsystem.power_input[f] / system.frequency.angular[f]
+                for subsystem in subsystems
+            ]
+            assert np.allclose(energies[:, f], np.linalg.solve(B, p))
+
+    @pytest.mark.parametrize("ordering", ["colamd", "mmd", "rcm", "natural"])
+    def test_solve_sparse_ordering(self, system, ordering):
+        pytest.importorskip("scipy")
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.solve(method="sparse", ordering=ordering)
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+        assert np.allclose(energies, expected, rtol=1e-10, atol=0.0)
+
+    def test_solve_sparse_unknown_ordering(self, system):
+        with pytest.raises(ValueError):
+            system.solve(method="sparse", ordering="unknown")
+
+    @pytest.mark.parametrize("precision", ["double", "single"])
+    def test_solve_mixed(self, system, precision):
+        pytest.importorskip("scipy")
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.precision = precision
+        assert system.power_balance_matrices().dtype == system.dtype
+        system.solve(method="mixed")
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        rtol = 1e-12 if precision == "double" else 1e-5
+        assert np.allclose(energies, expected, rtol=rtol, atol=0.0)
+        assert (system.convergence["residual"] < 1e-12).all()
+
+    @pytest.mark.parametrize(
+        "method",
+        ["dense", "batched", "sparse", "iterative", "incremental", "triangular"],
+    )
+    def test_solve_single(self, system, method):
+        pytest.importorskip("scipy")
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.precision = "single"
+        system.solve(method=method)
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+        assert np.allclose(energies, expected, rtol=1e-5, atol=0.0)
+
+    def test_invalid_precision(self, system):
+        with pytest.raises(ValueError):
+            system.precision = "half"
+
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_solve_parallel(self, system, executor):
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.solve(workers=2, executor=executor)
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+        assert np.array_equal(energies, expected)
+
+    def test_solve_blas_threads(self, system):
+        pytest.importorskip("threadpoolctl")
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.solve(workers=2, executor="thread", blas_threads=1)
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+        assert np.array_equal(energies, expected)
+
+    def test_disabled_bands(self, system):
+        system.frequency.enabled[:2] = False
+        system.solve()
+        for subsystem in system.subsystems:
+            assert not subsystem.modal_energy[:2].any()
+            assert subsystem.modal_energy[2:].all()
+
+    @pytest.mark.parametrize("solver", ["gmres", "bicgstab"])
+    @pytest.mark.parametrize("preconditioner", [None, "jacobi", "ilu"])
+    def test_solve_iterative(self, system, solver, preconditioner):
+        pytest.importorskip("scipy")
+        system.solve()
+        expected = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        system.solve(
+            method="iterative",
+            solver=solver,
+            preconditioner=preconditioner,
+            rtol=1e-12,
+            maxiter=1000,
+        )
+        energies = np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+        assert np.allclose(energies, expected, rtol=1e-3, atol=0.0)
+        assert len(system.convergence) == system.frequency.enabled.sum()
+        assert (system.convergence["residual"] < 1e-10).all()
+
+    def test_unknown_method(self, system):
+        with pytest.raises(ValueError):
+            system.solve(method="unknown")
+
+
+class TestTriangular:
+    def energies(self, system):
+        return np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+    @pytest.mark.parametrize("one_way", [False, True])
+    def test_solve_triangular(self, system, one_way):
+        if one_way:
+            # Energy flows only from the first room via the wall to the second room.
+            for coupling in system.couplings:
+                if coupling.subsystem_from.name == "room2_SubsystemLong" or (
+                    coupling.subsystem_to.name == "room1_SubsystemLong"
+                ):
+                    coupling.disable()
+        system.solve()
+        expected = self.energies(system)
+
+        system.solve(method="triangular")
+        assert np.allclose(self.energies(system), expected, rtol=1e-10, atol=0.0)
+
+
+class TestCases:
+    def test_solve_cases(self, system):
+        subsystems = list(system.subsystems)
+        n, bands = len(subsystems), len(system.frequency)
+        power = np.random.RandomState(1).rand(n, 3, bands)
+
+        energies = system.solve_cases(power)
+
+        assert energies.shape == (n, 3, bands)
+        assert not any(subsystem.modal_energy.any() for subsystem in subsystems)
+
+        B = system.power_balance_matrices()
+        for case in range(3):
+            for f in range(bands):
+                p = power[:, case, f] / system.frequency.angular[f]
+                assert np.allclose(energies[:, case, f], np.linalg.solve(B[f], p))
+
+    def test_invalid_shape(self, system):
+        with pytest.raises(ValueError):
+            system.solve_cases(np.ones((2, 3, 4)))
+
+
+class TestIncremental:
+    def energies(self, system):
+        return np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+    @pytest.mark.parametrize(
+        "name, attribute, value",
+        [
+            ("room2_SubsystemLong", "loss_factor", 0.1),
+            ("wall", "height", 0.1),
+            ("concrete", "loss_factor", 0.05),
+            ("excitation1", "velocity", 0.01),
+        ],
+    )
+    def test_solve_incremental(self, system, name, attribute, value):
+        system.solve_incremental()
+
+        setattr(system.get_object(name), attribute, value)
+        system.solve_incremental([name])
+        energies = self.energies(system)
+
+        system.solve()
+        assert np.allclose(energies, self.energies(system), rtol=1e-8, atol=0.0)
+
+    def test_tracking(self, system):
+        subsystem = system.get_object("room2_SubsystemLong")
+        subsystem.loss_factor = subsystem.dlf.copy()
+        system.solve(method="incremental")
+        assert not system._changes
+
+        loss_factor = subsystem.dlf.copy()
+        loss_factor[3] = 0.2
+        subsystem.loss_factor = loss_factor
+        assert system._changes["room2_SubsystemLong"] == {3}
+
+        system.solve(method="incremental")
+        energies = self.energies(system)
+        system.solve()
+        assert np.allclose(energies, self.energies(system), rtol=1e-8, atol=0.0)
+        assert not system._changes
+
+    def test_tracking_enable(self, system):
+        system.solve(method="incremental")
+        coupling = system.get_object("room1_SubsystemLong_room2_SubsystemLong")
+        coupling.disable()
+        assert set(system._changes) == {"room1_SubsystemLong"}
+
+        system.solve(method="incremental")
+        energies = self.energies(system)
+        system.solve()
+        assert np.allclose(energies, self.energies(system), rtol=1e-8, atol=0.0)
+
+    def test_structure_changed(self, system):
+        system.solve_incremental()
+        system.get_object("wall_SubsystemShear").disable()
+        system.solve_incremental()
+        energies = self.energies(system)
+
+        system.solve()
+        assert np.allclose(energies, self.energies(system), rtol=1e-8, atol=0.0)
+
+
+class TestBlocks:
+    @pytest.fixture
+    def system(self, system):
+        """Longitudinal and shear waves of the wall are not coupled to the rooms."""
+        for coupling in system.couplings:
+            if {"wall_SubsystemLong", "wall_SubsystemShear"}.intersection(
+                {coupling.subsystem_from.name, coupling.subsystem_to.name}
+            ):
+                coupling.disable()
+        return system
+
+    def energies(self, system):
+        return np.array([subsystem.modal_energy for subsystem in system.subsystems])
+
+    def test_blocks(self, system):
+        blocks = [[subsystem.name for subsystem in block] for block in system.blocks()]
+        assert blocks == [
+            ["room1_SubsystemLong", "room2_SubsystemLong", "wall_SubsystemBend"],
+            ["wall_SubsystemLong"],
+            ["wall_SubsystemShear"],
+        ]
+
+    @pytest.mark.parametrize("method", ["dense", "batched", "sparse", "incremental"])
+    def test_solve_blocks(self, system, method):
+        system.solve()
+        expected = self.energies(system)
+
+        system.solve(method=method, decomposition="blocks")
+        assert np.allclose(self.energies(system), expected, rtol=1e-10, atol=0.0)
+
+    def test_singular_block(self, system):
+        system.solve(decomposition="blocks")
+        expected = self.energies(system)
+
+        system.add_material(
+            "steel",
+            "MaterialSolid",
+            young=2.1e11,
+            poisson=0.3,
+            density=7.8e3,
+            loss_factor=0.0,
+            shear=8.0e10,
+        )
+        system.add_component(
+            "beam",
+            "Component1DBeam",
+            material="steel",
+            length=2.0,
+            height=0.1,
+            width=0.1,
+        )
+        with pytest.warns(UserWarning):
+            system.solve(decomposition="blocks")
+        energies = self.energies(system)
+
+        assert np.isnan(energies[len(expected) :]).all()
+        assert np.array_equal(energies[: len(expected)], expected)
+
+    def test_incremental(self, system):
+        system.solve(method="incremental", decomposition="blocks")
+        system.get_object("wall_SubsystemLong").loss_factor = 0.1
+        assert "wall_SubsystemLong" in system._changes
+
+        system.solve(method="incremental", decomposition="blocks")
+        energies = self.energies(system)
+        system.solve()
+        assert np.allclose(energies, self.energies(system), rtol=1e-8, atol=0.0)
+
+
+class TestInfluence:
+    def test_influence(self, system):
+        subsystems = [
+            subsystem for subsystem in system.subsystems if subsystem.included is True
+        ]
+        coefficients = system.influence()
+        assert coefficients.shape == (
+            len(system.frequency),
+            len(subsystems),
+            len(subsystems),
+        )
+
+        B = system.power_balance_matrices(subsystems)
+        n = np.array([subsystem.modal_density for subsystem in subsystems]).T
+        expected = (
+            np.linalg.inv(B) * n[..., None] / system.frequency.angular[:, None, None]
+        )
+        assert np.allclose(coefficients, expected, rtol=1e-8, atol=0.0)
+
+    def test_selection(self, system):
+        coefficients = system.influence()
+        row = system.influence("room2_SubsystemLong")
+        column = system.influence(sources="room1_SubsystemLong")
+        entry = system.influence("room2_SubsystemLong", "room1_SubsystemLong")
+        assert np.array_equal(row, coefficients[:, 1])
+        assert np.array_equal(column, coefficients[..., 0])
+        assert np.array_equal(entry, coefficients[:, 1, 0])
+
+    def test_excitation(self, system):
+        """The energy due to an excitation is its input power times a column."""
+        system.solve()
+        subsystem = system.get_object("room1_SubsystemLong")
+        column = system.influence(sources=subsystem.name)
+        energy = column * subsystem.power_input[:, None]
+        modal_density = np.array(
+            [subsystem.modal_density for subsystem in system.subsystems]
+        ).T
+        expected = (
+            np.array([subsystem.modal_energy for subsystem in system.subsystems]).T
+            * modal_density
+        )
+        assert np.allclose(energy, expected, rtol=1e-8, atol=0.0)
+
+    def test_cache(self, system):
+        system.influence()
+        inverse = list(system._inverse.values())
+        system.get_object("excitation1").velocity = 0.01
+        system.influence()
+        assert list(system._inverse.values()) == inverse
+
+        system.get_object("room2_SubsystemLong").loss_factor = 0.1
+        coefficients = system.influence()
+        system._inverse.clear()
+        system._changed_structure = True
+        assert np.allclose(coefficients, system.influence(), rtol=1e-8, atol=0.0)
+
+
+class TestModalEnergies:
+    @pytest.mark.parametrize("method", ["dense", "batched", "sparse", "incremental"])
+    def test_empty(self, system, method):
+        for component in system.components:
+            component.disable(subsystems=True)
+        assert system.solve(method=method)
+        assert not system.modal_energies.any()
+
+        for name in [subsystem.name for subsystem in system.subsystems]:
+            system.remove_object(name)
+        assert system.solve(method=method)
+        assert system.modal_energies.shape == (0, len(system.frequency))
+
+    def test_views(self, system):
+        system.solve()
+        modal_energies = system.modal_energies
+        assert modal_energies.shape == (
+            len(list(system.subsystems)),
+            len(system.frequency),
+        )
+        assert modal_energies.flags["C_CONTIGUOUS"]
+        for row, subsystem in enumerate(system.subsystems):
+            assert np.shares_memory(subsystem.modal_energy, modal_energies)
+            assert np.array_equal(subsystem.modal_energy, modal_energies[row])
+
+    def test_add_remove(self, system):
+        system.solve()
+        expected = {
+            subsystem.name: subsystem.modal_energy.copy()
+            for subsystem in system.subsystems
+        }
+        system.add_component(
+            "wall2",
+            "Component2DPlate",
+            material="concrete",
+            length=4.0,
+            width=5.0,
+            height=0.05,
+        )
+        assert len(system.modal_energies) == len(expected) + 3
+        system.remove_object("wall2_SubsystemShear")
+        assert len(system.modal_energies) == len(expected) + 2
+        for name, modal_energy in expected.items():
+            assert np.array_equal(system.get_object(name).modal_energy, modal_energy)
+
+    def test_lazy_allocation(self, system):
+        """Adding subsystems does not reallocate the storage until it is used."""
+        system.solve()
+        modal_energies = system.modal_energies
+        for i in range(3):
+            system.add_component(
+                "wall{}".format(i + 2),
+                "Component2DPlate",
+                material="concrete",
+                length=4.0,
+                width=5.0,
+                height=0.05,
+            )
+        assert system._modal_energies is modal_energies
+
+        subsystem = system.get_object("wall4_SubsystemBend")
+        subsystem.modal_energy = 1.0
+        assert len(system.modal_energies) == len(modal_energies) + 9
+        assert np.array_equal(system.modal_energies[-2], subsystem.modal_energy)
+        assert np.shares_memory(subsystem.modal_energy, system.modal_energies)
+        assert np.array_equal(
+            system.modal_energies[: len(modal_energies)], modal_energies
+        )
+
+    def test_batch(self, system):
+        system.solve()
+        expected = system.modal_energies.copy()
+        with system.batch({("concrete", "loss_factor"): [0.01, 0.02, 0.03]}):
+            system.solve()
+            assert system.modal_energies.shape == (3,) + expected.shape
+            subsystem = system.get_object("room2_SubsystemLong")
+            assert np.shares_memory(subsystem.modal_energy, system.modal_energies)
+        assert np.array_equal(system.modal_energies, expected)
@@ -0,0 +1,51 @@
+"""
+Tests for parameter sweeps.
+"""
+
+import numpy as np
+
+from seapy.sweep import sweep
+
+
+class TestSweep:
+    def test_sweep(self, system):
+        height = [0.05, 0.1, 0.2]
+        loss_factor = [0.01, 0.02]
+        result = sweep(
+            system,
+            {("wall", "height"): height, ("concrete", "loss_factor"): loss_factor},
+            quantity="pressure_level",
+        )
+
+        assert result.index.names == [
+            "wall.height",
+            "concrete.loss_factor",
+            "subsystem",
+        ]
+        assert len(result) == 3 * 2 * 2
+        assert list(result.columns) == list(system.frequency.center)
+
+        system.get_object("wall").height = height[2]
+        system.get_object("concrete").loss_factor = loss_factor[1]
+        system.solve()
+        expected = system.get_object("room2_SubsystemLong").pressure_level
+        assert np.allclose(result.loc[(0.2, 0.02, "room2_SubsystemLong")], expected)
+
+    def test_spectra(self, system):
+        bands = len(system.frequency)
+        loss_factor = np.array([np.full(bands, 0.01), np.linspace(0.01, 0.1, bands)])
+        result = sweep(system, {("room2_SubsystemLong", "loss_factor"): loss_factor})
+
+        assert result.index.levels[0].tolist() == [0, 1]
+        assert len(result) == 2 * 5
+
+        system.get_object("room2_SubsystemLong").loss_factor = loss_factor[1]
+        system.solve()
+        expected = system.get_object("room2_SubsystemLong").modal_energy
+        assert np.allclose(result.loc[(1, "room2_SubsystemLong")], expected)
+
+    def test_single_precision(self, system):
+        axes = {("wall", "height"): [0.05, 0.1]}
+        expected = sweep(system, axes)
+        system.precision = "single"
+        assert np.allclose(sweep(system, axes), expected, rtol=1e-5, atol=0.0)
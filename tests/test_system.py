@@ -119,3 +119,83 @@ class TestNewObject:
         subsystem1 = beam1.subsystem_long
         ex1 = subsystem1.add_excitation("ex1", "ExcitationPointForce")
         assert len(list(system.excitations)) == 1
+
+
+class TestLookup:
+    """Look up objects by name.
+    """
+
+    def test_get_object(self, system):
+        steel = system.add_material("steel", "MaterialSolid", young=1.0e7)
+        assert system.get_object("steel").name == "steel"
+        assert system.get_object(steel).name == "steel"
+        with pytest.raises(ValueError):
+            system.get_object("iron")
+
+    def test_duplicate_name(self, system):
+        system.add_material("steel", "MaterialSolid")
+        with pytest.warns(seapy.base.NameWarning):
+            steel = system.add_material("steel", "MaterialSolid")
+        assert steel.name == "steel1"
+        assert len(list(system.materials)) == 2
+
+    def test_remove_object(self, system):
+        steel = system.add_material("steel", "MaterialSolid")
+        system.remove_object(steel)
+        assert len(list(system.objects)) == 0
+        with pytest.raises(ValueError):
+            system.get_object("steel")
+
+
+class TestSorts:
+    """List objects of one sort.
+    """
+
+    @pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+    def test_sorts(self, system):
+        system.add_material("steel", "MaterialSolid", young=1.0e7)
+        beam1 = system.add_component(
+            "beam1", "Component1DBeam", material="steel", length=2.0
+        )
+        system.add_material("air", "MaterialGas")
+
+        assert [obj.name for obj in system.materials] == ["steel", "air"]
+        assert [obj.name for obj in system.components] == ["beam1"]
+        assert [obj.name for obj in system.subsystems] == [
+            "beam1_SubsystemLong",
+            "beam1_SubsystemBend",
+            "beam1_SubsystemShear",
+        ]
+        assert len(list(system.couplings)) == 0
+
+        system.remove_object("beam1_SubsystemBend")
+        assert [obj.name for obj in system.subsystems] == [
+            "beam1_SubsystemLong",
+            "beam1_SubsystemShear",
+        ]
+        assert {obj.name for obj in beam1.linked_subsystems} == {
+            "beam1_SubsystemLong",
+            "beam1_SubsystemShear",
+        }
+        assert len(list(system.objects)) == 5
+
+
+class TestProxies:
+    """Objects are accessed through a single proxy.
+    """
+
+    def test_proxies(self, system):
+        steel = system.add_material("steel", "MaterialSolid", young=1.0e7)
+        beam1 = system.add_component(
+            "beam1", "Component1DBeam", material="steel", length=2.0
+        )
+        assert system.get_object("steel") is steel
+        assert beam1.material is steel
+        assert beam1.subsystem_long.component is beam1
+        assert next(iter(system.materials)) is steel
+
+    def test_remove_object(self, system):
+        steel = system.add_material("steel", "MaterialSolid")
+        system.remove_object("steel")
+        with pytest.raises(ReferenceError):
+            steel.name
@@ -0,0 +1,121 @@
+"""
+Tests for the transient solution of a model.
+"""
+
+import numpy as np
+
+import pytest
+
+from seapy.transient import Decay
+
+pytest.importorskip("scipy")
+
+
+class TestTransient:
+    def test_steady(self, system):
+        system.solve()
+        expected = np.array([subsystem.energy for subsystem in system.subsystems]).T
+
+        time = np.linspace(0.0, 1.0, 11)
+        energies = system.solve_transient(time, initial="steady")
+
+        assert energies.shape == (len(time), len(system.frequency), len(expected.T))
+        assert np.allclose(energies, expected, rtol=1e-8, atol=0.0)
+
+    def test_decay(self, system):
+        from scipy.linalg import expm
+        from seapy.transient import loss_factor_matrices
+
+        subsystems = list(system.subsystems)
+        system.solve()
+        initial = np.array([subsystem.energy for subsystem in subsystems]).T
+
+        # Unequal time steps
+        time = np.array([0.0, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5])
+        energies = system.solve_transient(time, schedule=0.0, initial="steady")
+
+        L = loss_factor_matrices(system, subsystems)
+        for f, omega in enumerate(system.frequency.angular):
+            for k, t in enumerate(time):
+                assert np.allclose(
+                    energies[k, f], expm(-omega * L[f] * t) @ initial[f], rtol=1e-8
+                )
+
+    def test_schedule(self, system):
+        system.solve()
+        steady = np.array([subsystem.energy for subsystem in system.subsystems]).T
+
+        # Switch the source on, and off after one second.
+        time = np.linspace(0.0, 2.0, 401)
+        schedule = time < 1.0
+        energies = system.solve_transient(time, schedule=schedule)
+
+        assert not energies[0].any()
+        assert np.allclose(energies[200, 3:], steady[3:], rtol=1e-3)
+        assert (np.diff(energies[200:, 3:], axis=0) <= 0.0).all()
+
+    def test_disabled_bands(self, system):
+        system.frequency.enabled[:2] = False
+        energies = system.solve_transient([0.0, 0.1], initial="steady")
+        assert not energies[:, :2].any()
+        assert energies[:, 2:].all()
+
+    def test_invalid_schedule(self, system):
+        with pytest.raises(ValueError):
+            system.solve_transient([0.0, 0.1, 0.2], schedule=[1.0, 0.0])
+
+
+class TestDecay:
+    def test_energies(self, system):
+        decay = Decay(system)
+        time = np.linspace(0.0, 0.5, 11)
+        expected = system.solve_transient(time, schedule=0.0, initial="steady")
+
+        assert np.allclose(decay.energies(time), expected, rtol=1e-8, atol=0.0)
+        assert (decay.rates > 0.0).all()
+        assert np.allclose(np.abs(decay.sharing).sum(axis=1), 1.0)
+        assert (decay.sharing[..., 0] > 0.0).all()
+
+    def test_impulse_response(self, system):
+        decay = Decay(system)
+        energies = decay.impulse_response([0.0, 0.1], "room1_SubsystemLong")
+        assert np.allclose(energies[0, :, 0], 1.0)
+        assert np.allclose(energies[0, :, 1:], 0.0, atol=1e-12)
+
+    def test_reverberation_time(self, system):
+        for coupling in system.couplings:
+            coupling.disable()
+        subsystem = system.get_object("room1_SubsystemLong")
+
+        reverberation_time = Decay(system).reverberation_time()
+
+        assert list(reverberation_time.columns) == [
+            "room1_SubsystemLong",
+            "room2_SubsystemLong",
+        ]
+        expected = 6.0 * np.log(10.0) / (system.frequency.angular * subsystem.tlf)
+        assert np.allclose(
+            reverberation_time["room1_SubsystemLong"], expected, rtol=1e-3
+        )
+
+    def test_reverberation_time_coupled(self, system):
+        """The receiving room lags behind, so its decay takes longer than the window of the slowest rate."""
+        decay = Decay(system)
+        reverberation_time = decay.reverberation_time()
+
+        # Crossings of the decay curves sampled finely over a long duration.
+        duration = 20.0 / decay.rates.real.min(axis=-1)
+        time = np.linspace(0.0, 1.0, 200001)[:, None] * duration
+        levels = 10.0 * np.log10(decay.energies(time) / decay.initial)
+        for i, name in enumerate(decay.subsystems[:2]):
+            crossings = [
+                time[np.argmax(levels[..., i] <= level, axis=0), np.arange(len(time.T))]
+                for level in (-5.0, -35.0)
+            ]
+            expected = 2.0 * (crossings[1] - crossings[0])
+            assert np.allclose(reverberation_time[name], expected, rtol=1e-3)
+
+    def test_reverberation_time_not_reached(self, system):
+        reverberation_time = Decay(system).reverberation_time(extensions=0)
+        assert np.isnan(reverberation_time["room2_SubsystemLong"]).any()
+        assert np.isfinite(reverberation_time["room1_SubsystemLong"]).all()
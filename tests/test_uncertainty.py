@@ -0,0 +1,103 @@
+"""
+Tests for the propagation of uncertainty.
+"""
+
+import numpy as np
+
+import pytest
+
+from seapy.uncertainty import monte_carlo
+
+
+class TestBatch:
+    def test_batch(self, system):
+        room2 = system.get_object("room2_SubsystemLong")
+        loss_factor = np.array([0.01, 0.02, 0.05])
+
+        with system.batch({("concrete", "loss_factor"): loss_factor}):
+            system.solve()
+            levels = room2.pressure_level
+            assert system.power_balance_matrices().shape[:2] == (
+                3,
+                len(system.frequency),
+            )
+
+        assert levels.shape == (3, len(system.frequency))
+        assert not system.solved
+        assert room2.modal_energy.shape == (len(system.frequency),)
+
+        for sample, value in enumerate(loss_factor):
+            system.get_object("concrete").loss_factor = value
+            system.solve()
+            assert np.allclose(levels[sample], room2.pressure_level)
+
+    def test_invalid(self, system):
+        with pytest.raises(ValueError):
+            with system.batch(
+                {("concrete", "density"): [1.0, 2.0], ("wall", "height"): [1.0]}
+            ):
+                pass
+        with pytest.raises(ValueError):
+            with system.batch({("concrete", "clf"): [1.0, 2.0]}):
+                pass
+
+
+class TestMonteCarlo:
+    def test_monte_carlo(self, system):
+        def height(random_state, samples):
+            return random_state.uniform(0.04, 0.06, samples)
+
+        # Some heights result in negative energies in one band.
+        with pytest.warns(UserWarning, match="samples of pressure_level"):
+            result = monte_carlo(
+                system,
+                {("wall", "height"): height},
+                samples=200,
+                percentiles=(5.0, 50.0, 95.0),
+                seed=1,
+            )
+
+        assert list(result.columns) == list(system.frequency.center)
+        assert set(result.index.get_level_values("quantity")) == {
+            "pressure_level",
+            "velocity_level",
+        }
+        levels = result.loc["pressure_level", "room2_SubsystemLong"]
+        assert not levels.isna().any(axis=None)
+        assert (levels.loc[5.0] <= levels.loc[50.0]).all()
+        assert (levels.loc[50.0] <= levels.loc[95.0]).all()
+        assert (levels.loc[5.0] < levels.loc[95.0]).any()
+
+        with pytest.warns(UserWarning):
+            again = monte_carlo(
+                system, {("wall", "height"): height}, samples=200, seed=1
+            )
+        assert result.equals(again)
+
+    def test_scipy(self, system):
+        stats = pytest.importorskip("scipy.stats")
+        result = monte_carlo(
+            system,
+            {("concrete", "loss_factor"): stats.uniform(0.01, 0.03)},
+            samples=50,
+            quantities=("pressure_level",),
+            seed=1,
+        )
+        assert len(result) == 2 * 3
+
+    def test_single_precision(self, system):
+        def loss_factor(random_state, samples):
+            return random_state.uniform(0.01, 0.03, samples)
+
+        def levels(system):
+            return monte_carlo(
+                system,
+                {("concrete", "loss_factor"): loss_factor},
+                samples=20,
+                quantities=("pressure_level",),
+                seed=1,
+            )
+
+        expected = levels(system)
+        system.precision = "single"
+        assert np.allclose(levels(system), expected, rtol=0.0, atol=1e-3)